@@ -79,6 +79,7 @@ from app.rules import (
     get_active_classification_rules_for_app,
     get_all_exclusions_for_app,
     get_channel_name_mapping_for_app,
+    get_channel_rules,
     get_source_categories_for_app,
     save_source_categories_for_app,
 )
@@ -107,6 +108,7 @@ from app.utils import (
     _get_fallback_logger,
     _verify_write,
     atomic_write,
+    decode_bytes,
     safe_read_file,
 )
 
@@ -202,10 +204,12 @@ __all__ = [
     'catch_exception',
     'check_exclusion_for_app',
     'clear_domain_blacklist',
+    'decode_bytes',
     'format_error_response',
     'get_active_classification_rules_for_app',
     'get_all_exclusions_for_app',
     'get_channel_name_mapping_for_app',
+    'get_channel_rules',
     'get_domain_blacklist',
     'get_source_categories_for_app',
     'global_error_stats',
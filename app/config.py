@@ -7,12 +7,56 @@ Config 类 — 纯 SQLite 版配置管理。
 所有配置读写直接走 SQLite app_config 表，无 INI 文件依赖。
 """
 
+import contextlib
+import functools
 import logging
 import os
-from typing import Any, ClassVar
+from collections.abc import Callable
+from typing import Any, ClassVar, TypeVar
 
 from app.exceptions import ConfigError
 
+# 布尔配置值的真值写法（大小写不敏感）
+_TRUTHY_STRINGS = frozenset(('true', '1', 'yes', 'on'))
+_CANONICAL_BOOLS = {'True': True, 'False': False, 'true': True, 'false': False}
+
+_R = TypeVar('_R')
+
+
+def _memoize_on_snapshot(method: Callable[['Config'], _R]) -> Callable[['Config'], _R]:
+    """缓存 get_*_config() 的结果，直到全量配置快照刷新
+
+    以 get_all_config() 返回的快照对象作为失效钩子：快照在写入（invalidate_config_cache）
+    或 TTL 到期后会换成新对象，此时重算；否则直接返回上次构建的同一个 dict。
+    调用方应将返回值视为只读。
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: 'Config') -> _R:
+        try:
+            snapshot = self._get_config_dict()
+        except Exception:
+            return method(self)
+        entry = self._cache.get(method.__name__)
+        if entry is not None and entry[0] is snapshot:
+            return entry[1]
+        result = method(self)
+        self._cache[method.__name__] = (snapshot, result)
+        return result
+
+    return wrapper
+
+
+def _section_getter(name: str, section: str, doc: str, **extra: Any):
+    """由 Config._SCHEMA 生成纯类型化段的 get_*_config()：返回该段的类型化副本（附加 extra 常量键）"""
+
+    def getter(self) -> dict:
+        return {**self._typed_config()[section], **extra}
+
+    getter.__name__ = getter.__qualname__ = name
+    getter.__doc__ = doc
+    return _memoize_on_snapshot(getter)
+
 
 class Config:
     """配置管理类 — 纯 SQLite 版
@@ -126,6 +170,7 @@ class Config:
         'Logging.file': './log/app.log',
         'Logging.max_size': '10',
         'Logging.backup_count': '5',
+        'Logging.rotation': 'internal',  # internal=进程内按大小轮转; external=交给 logrotate 等外部工具（不做逐条大小检查）
         # [Filter]
         'Filter.max_latency': '4000',
         'Filter.min_bitrate': '80',
@@ -155,10 +200,90 @@ class Config:
         'EPG.inject_into_m3u': 'True',  # 在 #EXTM3U 头注入 url-tvg
     }
 
+    # get_*_config() 各段返回的键及类型（str/int/bool），顺序即返回 dict 的键顺序；
+    # _typed_config() 据此对每个配置快照一次性完成类型转换
+    _SCHEMA: ClassVar[dict[str, dict[str, type]]] = {
+        'Logging': {'level': str, 'file': str, 'max_size': int, 'backup_count': int, 'rotation': str},
+        'Network': {
+            'proxy_enabled': bool,
+            'proxy_type': str,
+            'proxy_host': str,
+            'proxy_port': int,
+            'proxy_username': str,
+            'proxy_password': str,
+            'github_mirror': str,
+            'ipv6_enabled': bool,
+            'download_connect_timeout': int,
+            'download_total_timeout': int,
+            'download_batch_size': int,
+        },
+        'GitHub': {'api_url': str, 'api_token': str, 'rate_limit': int},
+        'Testing': {
+            'timeout': int,
+            'concurrent_threads': int,
+            'cache_ttl': int,
+            'enable_speed_test': bool,
+            'speed_test_duration': int,
+            'enable_host_speed_share': bool,
+            'enable_source_freeze': bool,
+            'freeze_fail_threshold': int,
+            'freeze_base_seconds': int,
+            'freeze_max_hours': int,
+            'enable_ad_detect': bool,
+            'ad_keywords': str,
+            'ad_max_duration': int,
+            'global_blacklist': str,
+            'global_whitelist': str,
+            'output_sort_by': str,
+        },
+        'Filter': {
+            'max_latency': int,
+            'min_bitrate': int,
+            'must_hd': bool,
+            'must_4k': bool,
+            'min_speed': int,
+            'min_resolution': str,
+            'max_resolution': str,
+            'resolution_filter_mode': str,
+        },
+        # Output.output_dir 不在默认值表中，由 get_output_params 单独处理
+        'Output': {
+            'filename': str,
+            'group_by': str,
+            'include_failed': bool,
+            'max_sources_per_channel': int,
+            'enable_filter': bool,
+            'whitelist_force_keep': bool,
+        },
+        'HTTPServer': {
+            'enabled': bool,
+            'host': str,
+            'fileshare_port': int,
+            'manager_port': int,
+            'document_root': str,
+        },
+        'EPG': {
+            'enabled': bool,
+            'output_filename': str,
+            'refresh_mode': str,
+            'refresh_at': str,
+            'refresh_minutes': int,
+            'timezone': str,
+            'keep_days': int,
+            'past_hours': int,
+            'fetch_timeout': int,
+            'web_base_url': str,
+            'inject_into_m3u': bool,
+        },
+        'UserAgents': {'ua_position': str, 'ua_enabled': bool},
+    }
+
     def __init__(self):
         """初始化 Config（纯 SQLite 版，配置读写直接走 SQLite app_config 表）。"""
         self._models = None
         self._loaded = False
+        # get_*_config() 结果缓存：{方法名: (配置快照, 结果)}
+        self._cache: dict[str, tuple[dict, Any]] = {}
 
     def _get_models(self):
         """懒加载 web.models 模块"""
@@ -177,14 +302,21 @@ class Config:
         return self._get_models().get_all_config()
 
     def get(self, section: str, key: str, default: Any = None) -> str | None:
-        """从 SQLite 读取单个配置值"""
+        """从 SQLite 读取单个配置值
+
+        优先查 get_all_config() 的全量快照（{section: {key: value}}，带 TTL 缓存），
+        一次 get_*_config() 的十几次取值只是纯 dict 查找，不再逐键开连接查询、解密；
+        快照读取失败时回退单键查询。
+        """
         try:
-            val = self._get_models().get_app_config(f'{section}.{key}')
-            if val is not None:
-                return val
-        except Exception as e:
-            logging.warning(f'Config.get SQLite 读取失败 ({section}.{key}): {e}')
-        return default
+            val = self._get_config_dict().get(section, {}).get(key)
+        except Exception:
+            try:
+                val = self._get_models().get_app_config(f'{section}.{key}')
+            except Exception as e:
+                logging.warning(f'Config.get SQLite 读取失败 ({section}.{key}): {e}')
+                val = None
+        return default if val is None else val
 
     def getint(self, section: str, key: str, default: int = 0) -> int:
         val = self.get(section, key, str(default))
@@ -194,8 +326,8 @@ class Config:
             return default
 
     def getboolean(self, section: str, key: str, default: bool = False) -> bool:
-        val = self.get(section, key, 'True' if default else 'False')
-        return str(val).lower() in ('true', '1', 'yes', 'on')
+        val = self.get(section, key, None)
+        return default if val is None else self._to_bool(val)
 
     def getfloat(self, section: str, key: str, default: float = 0.0) -> float:
         val = self.get(section, key, str(default))
@@ -218,6 +350,7 @@ class Config:
             self._get_models().set_app_config(f'{section}.{key}', value)
         except Exception as e:
             logging.warning(f'Config.set SQLite 写入失败: {e}')
+        self._cache.clear()
 
     def save(self):
         """保留兼容（原用于 INI 保存），SQLite 模式无操作"""
@@ -230,216 +363,109 @@ class Config:
     def load_config(self):
         self._loaded = True
 
+    def reload(self):
+        """丢弃 get_*_config() 的缓存结果并重新加载"""
+        self._cache.clear()
+        self._get_models().invalidate_config_cache()
+        self.load_config()
+
     def _default(self, section: str, key: str) -> str:
         return self._DEFAULT_VALUES.get(f'{section}.{key}', '')
 
-    def _default_int(self, section: str, key: str) -> int:
+    @staticmethod
+    def _to_bool(val: Any) -> bool:
+        # 先按原样查规范写法（'True'/'False'，默认值与 Web 端写入的形式），命中则免去 lower() 折叠
+        result = _CANONICAL_BOOLS.get(val) if isinstance(val, str) else None
+        return str(val).lower() in _TRUTHY_STRINGS if result is None else result
+
+    @classmethod
+    @functools.cache
+    def _typed_defaults(cls) -> dict[str, dict[str, Any]]:
+        """按 _SCHEMA 转换好类型的默认值 {section: {key: value}}（进程内只算一次）"""
+        typed: dict[str, dict[str, Any]] = {}
+        for section, spec in cls._SCHEMA.items():
+            section_defaults: dict[str, Any] = {}
+            for key, cast in spec.items():
+                raw = cls._DEFAULT_VALUES.get(f'{section}.{key}', '')
+                if cast is bool:
+                    section_defaults[key] = cls._to_bool(raw)
+                elif cast is int:
+                    try:
+                        section_defaults[key] = int(raw)
+                    except ValueError:
+                        section_defaults[key] = 0
+                else:
+                    section_defaults[key] = raw
+            typed[section] = section_defaults
+        return typed
+
+    @_memoize_on_snapshot
+    def _typed_config(self) -> dict[str, dict[str, Any]]:
+        """按 _SCHEMA 把全量快照一次性转换为带类型的 {section: {key: value}}
+
+        以预先转换好的默认值为底，只覆盖快照中实际存在且合法的键（非法整数保留默认值，
+        语义同 getint/getboolean）。每个快照只转换一次，各 get_*_config() 直接取用。
+        """
         try:
-            return int(self._default(section, key))
-        except (ValueError, TypeError):
-            return 0
-
-    def _default_bool(self, section: str, key: str) -> bool:
-        return str(self._default(section, key)).lower() in ('true', '1', 'yes', 'on')
-
-    def get_logging_config(self) -> dict:
-        return {
-            'level': self.get('Logging', 'level', self._default('Logging', 'level')),
-            'file': self.get('Logging', 'file', self._default('Logging', 'file')),
-            'max_size': self.getint('Logging', 'max_size', self._default_int('Logging', 'max_size')),
-            'backup_count': self.getint('Logging', 'backup_count', self._default_int('Logging', 'backup_count')),
-            'enable_console': True,
-        }
-
-    def get_network_config(self) -> dict:
-        return {
-            'proxy_enabled': self.getboolean(
-                'Network',
-                'proxy_enabled',
-                self._default_bool('Network', 'proxy_enabled'),
-            ),
-            'proxy_type': self.get('Network', 'proxy_type', self._default('Network', 'proxy_type')),
-            'proxy_host': self.get('Network', 'proxy_host', self._default('Network', 'proxy_host')),
-            'proxy_port': self.getint('Network', 'proxy_port', self._default_int('Network', 'proxy_port')),
-            'proxy_username': self.get('Network', 'proxy_username', self._default('Network', 'proxy_username')),
-            'proxy_password': self.get('Network', 'proxy_password', self._default('Network', 'proxy_password')),
-            'github_mirror': self.get('Network', 'github_mirror', self._default('Network', 'github_mirror')),
-            'ipv6_enabled': self.getboolean('Network', 'ipv6_enabled', self._default_bool('Network', 'ipv6_enabled')),
-            'download_connect_timeout': self.getint(
-                'Network', 'download_connect_timeout', self._default_int('Network', 'download_connect_timeout')
-            ),
-            'download_total_timeout': self.getint(
-                'Network', 'download_total_timeout', self._default_int('Network', 'download_total_timeout')
-            ),
-            'download_batch_size': self.getint(
-                'Network', 'download_batch_size', self._default_int('Network', 'download_batch_size')
-            ),
-        }
-
-    def get_github_config(self) -> dict:
-        return {
-            'api_url': self.get('GitHub', 'api_url', self._default('GitHub', 'api_url')),
-            'api_token': self.get('GitHub', 'api_token', self._default('GitHub', 'api_token')),
-            'rate_limit': self.getint('GitHub', 'rate_limit', self._default_int('GitHub', 'rate_limit')),
-        }
-
-    def get_testing_params(self) -> dict:
-        return {
-            'timeout': self.getint('Testing', 'timeout', self._default_int('Testing', 'timeout')),
-            'concurrent_threads': self.getint(
-                'Testing',
-                'concurrent_threads',
-                self._default_int('Testing', 'concurrent_threads'),
-            ),
-            'cache_ttl': self.getint('Testing', 'cache_ttl', self._default_int('Testing', 'cache_ttl')),
-            'enable_speed_test': self.getboolean(
-                'Testing',
-                'enable_speed_test',
-                self._default_bool('Testing', 'enable_speed_test'),
-            ),
-            'speed_test_duration': self.getint(
-                'Testing',
-                'speed_test_duration',
-                self._default_int('Testing', 'speed_test_duration'),
-            ),
-            # 性能优化（对标 Guovin/iptv-api P0）
-            'enable_host_speed_share': self.getboolean(
-                'Testing',
-                'enable_host_speed_share',
-                self._default_bool('Testing', 'enable_host_speed_share'),
-            ),
-            'enable_source_freeze': self.getboolean(
-                'Testing',
-                'enable_source_freeze',
-                self._default_bool('Testing', 'enable_source_freeze'),
-            ),
-            'freeze_fail_threshold': self.getint(
-                'Testing',
-                'freeze_fail_threshold',
-                self._default_int('Testing', 'freeze_fail_threshold'),
-            ),
-            'freeze_base_seconds': self.getint(
-                'Testing',
-                'freeze_base_seconds',
-                self._default_int('Testing', 'freeze_base_seconds'),
-            ),
-            'freeze_max_hours': self.getint(
-                'Testing',
-                'freeze_max_hours',
-                self._default_int('Testing', 'freeze_max_hours'),
-            ),
-            # 质量与过滤增强（对标 Guovin/iptv-api P1/P2）
-            'enable_ad_detect': self.getboolean(
-                'Testing',
-                'enable_ad_detect',
-                self._default_bool('Testing', 'enable_ad_detect'),
-            ),
-            'ad_keywords': self.get('Testing', 'ad_keywords', self._default('Testing', 'ad_keywords')),
-            'ad_max_duration': self.getint(
-                'Testing',
-                'ad_max_duration',
-                self._default_int('Testing', 'ad_max_duration'),
-            ),
-            'global_blacklist': self.get(
-                'Testing',
-                'global_blacklist',
-                self._default('Testing', 'global_blacklist'),
-            ),
-            'global_whitelist': self.get(
-                'Testing',
-                'global_whitelist',
-                self._default('Testing', 'global_whitelist'),
-            ),
-            'output_sort_by': self.get('Testing', 'output_sort_by', self._default('Testing', 'output_sort_by')),
-            'max_workers': 50,
-        }
-
-    def get_filter_params(self) -> dict:
-        return {
-            'max_latency': self.getint('Filter', 'max_latency', self._default_int('Filter', 'max_latency')),
-            'min_bitrate': self.getint('Filter', 'min_bitrate', self._default_int('Filter', 'min_bitrate')),
-            'must_hd': self.getboolean('Filter', 'must_hd', self._default_bool('Filter', 'must_hd')),
-            'must_4k': self.getboolean('Filter', 'must_4k', self._default_bool('Filter', 'must_4k')),
-            'min_speed': self.getint('Filter', 'min_speed', self._default_int('Filter', 'min_speed')),
-            'min_resolution': self.get('Filter', 'min_resolution', self._default('Filter', 'min_resolution')),
-            'max_resolution': self.get('Filter', 'max_resolution', self._default('Filter', 'max_resolution')),
-            'resolution_filter_mode': self.get(
-                'Filter',
-                'resolution_filter_mode',
-                self._default('Filter', 'resolution_filter_mode'),
-            ),
-        }
-
+            snapshot = self._get_config_dict()
+        except Exception:
+            snapshot = None
+        typed: dict[str, dict[str, Any]] = {}
+        for section, defaults in self._typed_defaults().items():
+            if snapshot is None:
+                # 快照不可用时逐键读取（get() 内部回退单键查询）
+                values = {key: self.get(section, key) for key in defaults}
+            else:
+                values = snapshot.get(section, {})
+            merged = dict(defaults)
+            for key, cast in self._SCHEMA[section].items():
+                raw = values.get(key)
+                if raw is None:
+                    continue
+                if cast is bool:
+                    merged[key] = self._to_bool(raw)
+                elif cast is int:
+                    with contextlib.suppress(ValueError, TypeError):
+                        merged[key] = int(raw)
+                else:
+                    merged[key] = raw
+            typed[section] = merged
+        return typed
+
+    # 只是"段内各键按 _SCHEMA 类型化"的 getter 直接由 schema 生成，不再手写逐键代码
+    get_logging_config = _section_getter('get_logging_config', 'Logging', '日志配置', enable_console=True)
+    get_network_config = _section_getter('get_network_config', 'Network', '网络/代理配置')
+    get_github_config = _section_getter('get_github_config', 'GitHub', 'GitHub API 配置')
+    get_testing_params = _section_getter('get_testing_params', 'Testing', '测速参数', max_workers=50)
+    get_filter_params = _section_getter('get_filter_params', 'Filter', '质量过滤参数')
+
+    @_memoize_on_snapshot
     def get_output_params(self) -> dict:
         output_dir = self.get('Output', 'output_dir', './www/output')
         if output_dir and not os.path.isabs(output_dir):
             output_dir = os.path.abspath(output_dir)
-        return {
-            'filename': self.get('Output', 'filename', self._default('Output', 'filename')),
-            'group_by': self.get('Output', 'group_by', self._default('Output', 'group_by')),
-            'include_failed': self.getboolean(
-                'Output',
-                'include_failed',
-                self._default_bool('Output', 'include_failed'),
-            ),
-            'max_sources_per_channel': self.getint(
-                'Output',
-                'max_sources_per_channel',
-                self._default_int('Output', 'max_sources_per_channel'),
-            ),
-            'enable_filter': self.getboolean('Output', 'enable_filter', self._default_bool('Output', 'enable_filter')),
-            'whitelist_force_keep': self.getboolean(
-                'Output',
-                'whitelist_force_keep',
-                self._default_bool('Output', 'whitelist_force_keep'),
-            ),
-            'output_dir': output_dir,
-        }
+        return {**self._typed_config()['Output'], 'output_dir': output_dir}
 
+    @_memoize_on_snapshot
     def get_http_server_config(self) -> dict:
-        config = {
-            'enabled': self.getboolean('HTTPServer', 'enabled', self._default_bool('HTTPServer', 'enabled')),
-            'host': self.get('HTTPServer', 'host', self._default('HTTPServer', 'host')),
-            'fileshare_port': self.getint(
-                'HTTPServer',
-                'fileshare_port',
-                self._default_int('HTTPServer', 'fileshare_port'),
-            ),
-            'manager_port': self.getint(
-                'HTTPServer',
-                'manager_port',
-                self._default_int('HTTPServer', 'manager_port'),
-            ),
-            'document_root': self.get(
-                'HTTPServer',
-                'document_root',
-                self._default('HTTPServer', 'document_root'),
-            ),
-        }
+        config = dict(self._typed_config()['HTTPServer'])
         if config['document_root'] and not os.path.isabs(config['document_root']):
             config['document_root'] = os.path.abspath(config['document_root'])
         return config
 
+    @_memoize_on_snapshot
     def get_epg_config(self) -> dict:
         """读取 EPG 段配置（电子节目单）。
 
         返回归一化后的字典，供 app.epg / web.routes.epg / m3u_generator 共用。
         """
+        epg = self._typed_config()['EPG']
 
-        def _s(key: str) -> str:
-            return self.get('EPG', key, self._default('EPG', key)) or ''
-
-        def _i(key: str) -> int:
-            return self.getint('EPG', key, self._default_int('EPG', key))
-
-        def _b(key: str) -> bool:
-            return self.getboolean('EPG', key, self._default_bool('EPG', key))
-
-        refresh_mode = (_s('refresh_mode') or 'daily').strip().lower()
+        refresh_mode = (epg['refresh_mode'] or 'daily').strip().lower()
         if refresh_mode not in ('daily', 'interval'):
             refresh_mode = 'daily'
 
-        refresh_at = (_s('refresh_at') or '03:30').strip()
+        refresh_at = (epg['refresh_at'] or '03:30').strip()
         # 兜底非法时刻，避免调度器炸掉
         try:
             hh, mm = refresh_at.split(':')
@@ -450,38 +476,42 @@ class Config:
             refresh_at = '03:30'
 
         return {
-            'enabled': _b('enabled'),
-            'output_filename': _s('output_filename') or 'epg.xml.gz',
+            'enabled': epg['enabled'],
+            'output_filename': epg['output_filename'] or 'epg.xml.gz',
             'refresh_mode': refresh_mode,
             'refresh_at': refresh_at,
-            'refresh_minutes': max(5, _i('refresh_minutes')),
-            'timezone': _s('timezone') or 'Asia/Shanghai',
-            'keep_days': max(1, _i('keep_days')),
-            'past_hours': max(0, _i('past_hours')),
-            'fetch_timeout': max(5, _i('fetch_timeout')),
-            'web_base_url': _s('web_base_url').strip().rstrip('/'),
-            'inject_into_m3u': _b('inject_into_m3u'),
+            'refresh_minutes': max(5, epg['refresh_minutes']),
+            'timezone': epg['timezone'] or 'Asia/Shanghai',
+            'keep_days': max(1, epg['keep_days']),
+            'past_hours': max(0, epg['past_hours']),
+            'fetch_timeout': max(5, epg['fetch_timeout']),
+            'web_base_url': epg['web_base_url'].strip().rstrip('/'),
+            'inject_into_m3u': epg['inject_into_m3u'],
         }
 
+    # UserAgents 段中的开关键（其余键均为 UA 名称 → UA 字符串）
+    _UA_SWITCH_KEYS: ClassVar[frozenset[str]] = frozenset(('ua_position', 'ua_enabled'))
+
     def get_ua_position(self) -> str:
-        return self.get('UserAgents', 'ua_position', self._default('UserAgents', 'ua_position')) or ''
+        return self._typed_config()['UserAgents']['ua_position'] or ''
 
     def is_ua_enabled(self) -> bool:
-        return self.getboolean('UserAgents', 'ua_enabled', self._default_bool('UserAgents', 'ua_enabled'))
+        return self._typed_config()['UserAgents']['ua_enabled']
 
+    @_memoize_on_snapshot
     def get_user_agents(self) -> dict:
-        """从 SQLite 读取 UserAgents 段的所有 UA 配置"""
-        ua_config: dict[str, str] = {}
+        """从 SQLite 读取 UserAgents 段的所有 UA 配置（不含 ua_position/ua_enabled 两个开关键）
+
+        每个配置快照只过滤一次；两个开关由 get_ua_position/is_ua_enabled 从类型化配置读取。
+        """
         try:
-            all_cfg = self._get_models().get_all_config()
-            section_data = all_cfg.get('UserAgents', {})
-            for key, value in section_data.items():
-                if key not in ('ua_position', 'ua_enabled'):
-                    ua_config[key] = str(value)
+            section_data = self._get_config_dict().get('UserAgents', {})
         except Exception:
             logging.warning('get_user_agents 从 SQLite 读取失败')
-        return ua_config
+            return {}
+        return {key: str(value) for key, value in section_data.items() if key not in self._UA_SWITCH_KEYS}
 
+    @_memoize_on_snapshot
     def get_source_file_ua_settings(self) -> dict:
         import json as _json
 
@@ -492,6 +522,7 @@ class Config:
         except Exception:
             return {}
 
+    @_memoize_on_snapshot
     def get_channel_ua_overrides(self) -> dict:
         import json as _json
 
@@ -502,27 +533,16 @@ class Config:
         except Exception:
             return {}
 
-    def get_sources(self) -> dict:
-        local_dirs_raw = self.get('Sources', 'local_dirs', './config/sources')
-        if isinstance(local_dirs_raw, str):
-            local_dirs = [d.strip() for d in local_dirs_raw.split(',')]
-        else:
-            local_dirs = local_dirs_raw
-
-        online_urls_raw = self.get('Sources', 'online_urls', '')
-        if online_urls_raw:
-            online_urls = [url.strip() for url in online_urls_raw.split('\n') if url.strip()]
-        else:
-            online_urls = []
-
-        github_sources_raw = self.get('Sources', 'github_sources', '')
-        if github_sources_raw:
-            github_sources = [s.strip() for s in github_sources_raw.split('\n') if s.strip()]
-        else:
-            github_sources = []
+    @staticmethod
+    def _split_list(raw: str | None, sep: str) -> list[str]:
+        """按分隔符拆分配置列表，去掉首尾空白并丢弃空项"""
+        return [item for item in (part.strip() for part in (raw or '').split(sep)) if item]
 
+    @_memoize_on_snapshot
+    def get_sources(self) -> dict:
+        """Sources 段的三个列表；每个配置快照只拆分一次（见 _memoize_on_snapshot）"""
         return {
-            'local_dirs': local_dirs,
-            'online_urls': online_urls,
-            'github_sources': github_sources,
+            'local_dirs': self._split_list(self.get('Sources', 'local_dirs', './config/sources'), ','),
+            'online_urls': self._split_list(self.get('Sources', 'online_urls'), '\n'),
+            'github_sources': self._split_list(self.get('Sources', 'github_sources'), '\n'),
         }
@@ -9,16 +9,35 @@
   - Logger — 日志管理类（文件轮转 + 控制台输出）
 """
 
+import atexit
 import contextlib
 import logging
-import logging.handlers
 import os
+import queue
 import sys
 
 # 统一日志格式
 UNIFIED_LOG_FORMAT = '[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s'
 UNIFIED_LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
 
+# Logger.setup_logging 用：级别名 → 数值（含 WARN/FATAL 别名，与 getattr(logging, name) 一致）与共享格式化器
+_LEVEL_MAP = logging.getLevelNamesMapping()
+_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+
+# 当前生效的后台日志线程（Logger.setup_logging 启动；重新初始化或进程退出时停止并写完队列）
+_active_listener = None
+
+
+def _stop_active_listener():
+    global _active_listener
+    listener, _active_listener = _active_listener, None
+    if listener is not None:
+        with contextlib.suppress(Exception):
+            listener.stop()
+
+
+atexit.register(_stop_active_listener)
+
 
 def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     """创建统一格式的日志记录器"""
@@ -40,25 +59,42 @@ class Logger:
     """日志管理类 — 增强错误处理（与原版完全一致）"""
 
     def __init__(self, config: dict):
+        self.listener = None
         self.logger = self.setup_logging(config)
 
+    def close(self):
+        """停止后台日志线程（先写完队列中剩余的日志）"""
+        global _active_listener
+        listener, self.listener = self.listener, None
+        if listener is None:
+            return
+        if _active_listener is listener:
+            _active_listener = None
+        with contextlib.suppress(Exception):
+            listener.stop()
+
     def setup_logging(self, config: dict):
-        """配置日志系统 - 增强错误处理"""
+        """配置日志系统 - 增强错误处理
+
+        logger 上只挂一个 QueueHandler：业务线程记录日志只是一次入队，
+        格式化、写文件与轮转由后台 QueueListener 线程完成，不阻塞测速等工作线程。
+        """
+        global _active_listener
+        # logging.handlers 连带导入 socket/pickle 等，推迟到初始化日志时才导入
+        from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, WatchedFileHandler
+
         logger = logging.getLogger('LiveSourceManager')
 
         # 设置日志级别
-        log_level = getattr(logging, config.get('level', 'INFO').upper(), logging.INFO)
+        log_level = _LEVEL_MAP.get(config.get('level', 'INFO').upper(), logging.INFO)
         logger.setLevel(log_level)
 
-        # 清除现有处理器
-        for handler in logger.handlers[:]:
-            logger.removeHandler(handler)
+        # 新处理器先收集到本地列表，最后一次性替换（不再逐个 removeHandler/addHandler）
+        handlers: list[logging.Handler] = []
+        # 装配期间的诊断信息先暂存（此时尚无可用处理器），装配完成后经新处理器以惰性 % 格式输出，不再 print
+        pending: list[tuple[str, tuple]] = []
 
-        # 创建格式化器
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S',
-        )
+        formatter = _FORMATTER
 
         # 文件处理器（如果配置了文件路径）
         log_file = config.get('file', '/log/app.log')
@@ -67,46 +103,63 @@ class Logger:
         if log_file:
             try:
                 log_dir = os.path.dirname(log_file)
-                if not os.path.exists(log_dir):
+                if log_dir:
+                    # exist_ok=True 已涵盖目录存在的情况，无需先 stat
                     os.makedirs(log_dir, exist_ok=True)
 
-                if config.get('clear_on_startup', False) and os.path.exists(log_file):
+                if config.get('clear_on_startup', False):
                     try:
                         os.remove(log_file)
+                    except FileNotFoundError:
+                        pass
                     except Exception as e:
-                        print(f'无法清空日志文件: {e}')
-
-                max_size = config.get('max_size', 10) * 1024 * 1024
-                backup_count = config.get('backup_count', 5)
-
-                file_handler = logging.handlers.RotatingFileHandler(
-                    log_file,
-                    maxBytes=max_size,
-                    backupCount=backup_count,
-                    encoding='utf-8',
-                )
+                        pending.append(('无法清空日志文件: %s', (e,)))
+
+                if str(config.get('rotation', 'internal')).strip().lower() == 'external':
+                    # 外部轮转：不做逐条大小检查；文件被移走/截断后 WatchedFileHandler 自动重新打开
+                    file_handler = WatchedFileHandler(log_file, encoding='utf-8')
+                else:
+                    max_size = config.get('max_size', 10) * 1024 * 1024
+                    backup_count = config.get('backup_count', 5)
+
+                    file_handler = RotatingFileHandler(
+                        log_file,
+                        maxBytes=max_size,
+                        backupCount=backup_count,
+                        encoding='utf-8',
+                    )
                 file_handler.setFormatter(formatter)
-                logger.addHandler(file_handler)
+                handlers.append(file_handler)
             except Exception as e:
-                print(f'创建文件日志处理器失败: {e}')
+                pending.append(('创建文件日志处理器失败: %s', (e,)))
 
         # 控制台处理器（如果启用）
         if config.get('enable_console', True):
             try:
                 console_handler = logging.StreamHandler(sys.stdout)
                 console_handler.setFormatter(formatter)
-                logger.addHandler(console_handler)
+                handlers.append(console_handler)
             except Exception as e:
-                print(f'创建控制台日志处理器失败: {e}')
+                pending.append(('创建控制台日志处理器失败: %s', (e,)))
 
         # 如果没有任何处理器，添加一个基本的控制台处理器
-        if not logger.handlers:
-            print('警告: 无日志处理器，创建基本控制台处理器')
+        if not handlers:
+            pending.append(('无日志处理器，创建基本控制台处理器', ()))
             basic_handler = logging.StreamHandler(sys.stdout)
             basic_handler.setFormatter(formatter)
-            logger.addHandler(basic_handler)
+            handlers.append(basic_handler)
+
+        # 启动新的后台线程，单次赋值换上 QueueHandler；旧线程在换下后停止并写完其队列
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        logger.handlers = [QueueHandler(log_queue)]
+        _stop_active_listener()
+        _active_listener = self.listener = listener
 
         with contextlib.suppress(Exception):
+            for msg, args in pending:
+                logger.warning(msg, *args)
             logger.info('日志系统初始化完成')
 
         return logger
@@ -4,11 +4,137 @@
 支持分层筛选、智能分类和多维分组。
 """
 
+import collections
+import contextlib
+import functools
+import io
+import os
 import re
+import string
+import sys
+from collections.abc import Callable, Sequence
 
 from app.config import Config
 from app.rules import get_source_categories_for_app
 
+# tvg-id 回退 slug：非 ASCII 字母数字的字符（含中文等非 ASCII 字符）逐个替换为下划线。
+# str.translate 查表替代正则字符类替换；表外码点由 defaultdict 映射为 '_'（首次命中后写入表中）
+_TVG_ID_TABLE: collections.defaultdict[int, int] = collections.defaultdict(
+    lambda: ord('_'), {ord(c): ord(c) for c in string.ascii_letters + string.digits}
+)
+
+
+@functools.lru_cache(maxsize=8192)
+def _tvg_id(name: str) -> str:
+    """频道名 → tvg-id slug（同名频道在多个源间大量重复，按名称缓存）"""
+    return name.translate(_TVG_ID_TABLE).lower()
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_resolution(res: str) -> tuple[int, int] | None:
+    """解析分辨率字符串为 (宽度, 高度)，无法解析时返回 None（由调用方决定回退值）
+
+    支持 1920x1080 与 720p（按 16:9 推算宽度）；分辨率取值高度重复，按字符串缓存。
+    """
+    if 'x' in res:
+        parts = res.split('x')
+        if len(parts) == 2:
+            try:
+                return int(parts[0]), int(parts[1])
+            except (ValueError, TypeError):
+                return None
+    elif res.endswith('p'):
+        try:
+            height = int(res[:-1])
+            width = int(height * 16 / 9)  # 假设宽高比为16:9
+            return width, height
+        except (ValueError, TypeError):
+            return None
+    return None
+
+
+# 流式写出播放列表文件时的缓冲区大小：逐行的小写入攒成 512 KiB 的块再落盘
+_WRITE_BUFFER_SIZE = 512 * 1024
+
+
+# 分组依据 → (源字段, 缺省值)；未知的 group_by 统一归入 'All Channels'
+_GROUP_KEY_FIELDS: dict[str, tuple[str, str]] = {
+    'country': ('country', 'Unknown'),
+    'region': ('region', 'Unknown'),
+    'category': ('category', 'Unknown'),
+    'media_type': ('media_type', 'video'),
+    'source': ('source_type', 'Unknown'),
+}
+
+
+def _intern(value):
+    """字符串驻留（非 str 原样返回）：分组键、排序键中的低基数字符串大量重复，
+    驻留后相等比较退化为指针比较（dict 键查找、元组逐项比较都先比身份）"""
+    return sys.intern(value) if type(value) is str else value
+
+
+@functools.lru_cache(maxsize=16)
+def _group_key_accessor(group_by: str):
+    """按分组依据选出取分组键的函数（每次分组只分派一次，不再逐源走 if/elif 链）
+
+    按 group_by 缓存：逐源调用 get_group_key 时不再每次新建闭包。
+    """
+    spec = _GROUP_KEY_FIELDS.get(group_by)
+    if spec is None:
+        return lambda source: 'All Channels'
+    field, default = spec
+
+    def accessor(source: dict) -> str:
+        return _intern(source.get(field, default) or default)
+
+    return accessor
+
+
+def _name_sort_key(source: dict) -> str:
+    """按名称排序（None 视为空串）"""
+    return source.get('name', '') or ''
+
+
+def _speed_rank_key(source: dict) -> tuple:
+    """同一地域内的 speed 排序键：测速降序 + 响应时间升序 + 名称（None 值归一）
+
+    数值统一转成 float：测速/响应时间常见 int 与 float 混杂，键的首项类型一致时
+    list.sort 才会走 float 专用比较快路径（否则每次比较都走通用的富比较分派）。
+    """
+    get = source.get
+    return (
+        -float(get('download_speed', 0) or 0),
+        float(get('response_time', 9999) or 9999),
+        get('name', '') or '',
+    )
+
+
+def _sort_by_speed(sources: list[dict]) -> None:
+    """默认 speed 排序（原地）：按地域 (continent, country, province) 分组后，测速降序 + 响应时间升序（快源在前）
+
+    地域取值基数很低：先按地域分桶、桶按地域排序，桶内只按 3 元数值键排序。
+    结果与按 6 元组整体稳定排序相同，但每次比较不再重复比较地域前缀。
+    """
+    buckets: collections.defaultdict[tuple, list[dict]] = collections.defaultdict(list)
+    for source in sources:
+        get = source.get
+        buckets[
+            _intern(get('continent', '') or ''),
+            _intern(get('country', '') or ''),
+            _intern(get('province', '') or ''),
+        ].append(source)
+
+    if len(buckets) == 1:
+        sources.sort(key=_speed_rank_key)
+        return
+
+    result: list[dict] = []
+    for geo in sorted(buckets):
+        bucket = buckets[geo]
+        bucket.sort(key=_speed_rank_key)
+        result.extend(bucket)
+    sources[:] = result
+
 
 class M3UGenerator:
     """增强版M3U文件生成器 - 支持分层筛选和智能分类"""
@@ -32,8 +158,28 @@ class M3UGenerator:
         self._whitelist_entries = self._parse_list(
             config.get('Testing', 'global_whitelist', '') if hasattr(config, 'get') else ''
         )
+        # 分组/排序/分组标题配置在整个生成过程中不变：一次取出冻结为普通属性，热路径不再逐源按字符串下标或调用 config.get
+        self.group_by = self.output_params['group_by']
+        self.output_sort_by = (self.output_params.get('output_sort_by') or 'speed').lower()
+        self.group_title_format = config.get('m3u_group_title_format', '') if hasattr(config, 'get') else ''
         # EPG 注入相关缓存（L2 不硬依赖 web/app.epg，懒加载）
         self._tvg_map_cache: dict[str, dict[str, str]] | None = None
+        # EXTINF 行缓存：(id(源), 层级) → (源, EXTINF)，仅在 extinf_cache_round() 内启用（默认 None 即不缓存）；
+        # 值中持有源本身，校验 is 同一对象以防 id 被回收复用
+        self._extinf_cache: dict[tuple[int, str], tuple[dict, str]] | None = None
+
+    @contextlib.contextmanager
+    def extinf_cache_round(self):
+        """一轮生成（基础列表 → 高级列表）内复用 EXTINF 行，离开时丢弃缓存
+
+        高级列表是基础列表的子集（同一批源 dict），轮内第二次生成直接复用已构建的 EXTINF 与 DB 维度覆盖；
+        轮外的生成调用不缓存，调用方修改源后再次生成总能得到最新内容。
+        """
+        self._extinf_cache = {}
+        try:
+            yield self
+        finally:
+            self._extinf_cache = None
 
     def _load_tvg_map(self) -> dict[str, dict[str, str]]:
         """懒加载频道名 → EPG(tvg_id/tvg_logo) 映射，供 EXTINF 注入。
@@ -121,71 +267,87 @@ class M3UGenerator:
         Returns:
             str: M3U文件内容
         """
-        output_lines = ['#EXTM3U']
+        # 直接写入 StringIO 缓冲区，不保留 2·N 行的中间列表
+        buf = io.StringIO()
+        self._write_enhanced_m3u(sources, level, buf.write)
+        return buf.getvalue()
+
+    def generate_enhanced_m3u_to_file(
+        self, sources: list[dict], path: str, level: str = 'base', mode: int | None = None
+    ) -> None:
+        """生成增强版M3U文件并直接流式写入磁盘（不在内存中拼出整份内容）
 
+        Args:
+            sources: 源数据列表
+            path: 目标文件路径（调用方负责原子替换）
+            level: 层级标识 (base/qualified)
+            mode: 文件权限；给出时在已打开的文件描述符上设置（不受 umask 影响，也无需事后按路径 chmod）
+        """
+        # 大缓冲区把逐行的小写入攒成大块再落盘，减少系统调用次数
+        with open(path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+            if mode is not None and hasattr(os, 'fchmod'):
+                os.fchmod(f.fileno(), mode)
+            self._write_enhanced_m3u(sources, level, f.write)
+
+    def _write_enhanced_m3u(self, sources: list[dict], level: str, write: Callable[[str], object]) -> None:
+        """按行把增强版M3U内容交给 write；每行以前置换行分隔（末尾无换行，与 join 一致）"""
         # ── EPG 注入：#EXTM3U 头追加 url-tvg / x-tvg-url（url 先用 http，受 inject_into_m3u 控制）──
         epg_attr = self._epg_url_attr(self.config)
-        if epg_attr:
-            output_lines[0] = '#EXTM3U' + epg_attr
+        write('#EXTM3U' + epg_attr)
 
         # 一次性加载频道 → EPG(tvg_id/tvg_logo) 映射，供 EXTINF 注入
         tvg_map = self._load_tvg_map()
+        extinf_cache = self._extinf_cache
+        # 只缓存调用方传入的源：多分类展开出的副本每次都是新对象，永远命中不了，缓存只会白白持有
+        cacheable_ids = set(map(id, sources)) if extinf_cache is not None else None
 
-        # 根据层级决定筛选策略
+        # 根据层级决定筛选策略，过滤、多分类展开与分组在同一次遍历中完成
         if level == 'base':
             # 基础层级：使用所有传入的源（已经过分辨率筛选）
-            filtered_sources = sources
-            self.logger.info(f'基础层级: 使用 {len(filtered_sources)} 个源')
-        else:
+            self.logger.info(f'基础层级: 使用 {len(sources)} 个源')
+        grouped_sources, kept, total = self._filter_and_group(sources, apply_filter=level != 'base', expand_multi=True)
+        if level != 'base':
             # 高级层级：根据条件筛选
-            filtered_sources = self.enhanced_filter_sources(sources)
-            self.logger.info(f'高级层级: 从 {len(sources)} 个源中筛选出 {len(filtered_sources)} 个合格源')
-
-        # ── 多分类展开：content 含逗号时复制频道到多个分组 ──
-        expanded_sources = []
-        for s in filtered_sources:
-            content_val = s.get('content', '') or ''
-            if ',' in content_val:
-                for single_content in [c.strip() for c in content_val.split(',') if c.strip()]:
-                    s_copy = dict(s)
-                    s_copy['content'] = single_content
-                    s_copy['category'] = single_content
-                    expanded_sources.append(s_copy)
-            else:
-                expanded_sources.append(s)
-
-        if len(expanded_sources) != len(filtered_sources):
-            self.logger.info(f'多分类展开: {len(filtered_sources)} → {len(expanded_sources)} 个源')
-
-        # 按增强分组对源进行排序和分组
-        grouped_sources = self.enhanced_group_and_sort_sources(expanded_sources, level)
+            self.logger.info(f'高级层级: 从 {len(sources)} 个源中筛选出 {kept} 个合格源')
+        if total != kept:
+            self.logger.info(f'多分类展开: {kept} → {total} 个源')
 
         # 生成M3U内容
         for group, group_sources in grouped_sources.items():
             # 添加分组注释
-            output_lines.append(f'#EXTGRP:{group}')
+            write('\n')
+            write(f'#EXTGRP:{group}')
 
             for source in group_sources:
-                # ── 优先从 stream_source_categories 表读取维度分类 ──
-                source_id = source.get('id') if isinstance(source, dict) else None
-                if source_id:
-                    try:
-                        cat_from_db = get_source_categories_for_app(source_id)
-                    except Exception:
-                        cat_from_db = {}
+                cache_key = (id(source), level)
+                cached = extinf_cache.get(cache_key) if extinf_cache is not None else None
+                if cached is not None and cached[0] is source:
+                    # 同一源已生成过（DB 维度覆盖也已写回该源），跳过查库与 EXTINF 重建
+                    extinf = cached[1]
                 else:
-                    cat_from_db = {}
+                    # ── 优先从 stream_source_categories 表读取维度分类 ──
+                    source_id = source.get('id') if isinstance(source, dict) else None
+                    if source_id:
+                        try:
+                            cat_from_db = get_source_categories_for_app(source_id)
+                        except Exception:
+                            cat_from_db = {}
+                    else:
+                        cat_from_db = {}
 
-                # 如果 DB 中有手动修正的维度，覆盖自动匹配结果
-                if cat_from_db:
-                    for dim_key, dim_value in cat_from_db.items():
-                        if dim_value and dim_value != '未知':
-                            source[dim_key] = dim_value
-                            if dim_key == 'content':
-                                source['category'] = dim_value
+                    # 如果 DB 中有手动修正的维度，覆盖自动匹配结果
+                    if cat_from_db:
+                        for dim_key, dim_value in cat_from_db.items():
+                            if dim_value and dim_value != '未知':
+                                source[dim_key] = dim_value
+                                if dim_key == 'content':
+                                    source['category'] = dim_value
 
-                extinf = self.build_enhanced_extinf(source, level, tvg_map)
-                output_lines.append(extinf)
+                    extinf = self.build_enhanced_extinf(source, level, tvg_map)
+                    if extinf_cache is not None and cacheable_ids is not None and cache_key[0] in cacheable_ids:
+                        extinf_cache[cache_key] = (source, extinf)
+                write('\n')
+                write(extinf)
 
                 # 构建URL
                 url = source['url']
@@ -193,9 +355,8 @@ class M3UGenerator:
                 if self.ua_enabled and source.get('user_agent') and ua_pos == 'url':
                     url = f'{url}|User-Agent={source["user_agent"]}'
 
-                output_lines.append(url)
-
-        return '\n'.join(output_lines)
+                write('\n')
+                write(url)
 
     def generate_txt(self, sources: list[dict], level: str = 'base') -> str:
         """生成TXT文件内容（别名，保持对外接口一致）
@@ -219,23 +380,23 @@ class M3UGenerator:
         Returns:
             str: TXT文件内容
         """
-        output_lines = []
+        # 直接写入 StringIO 缓冲区；每个分组块以 "# 分组" 开头、每行以换行结尾，分组之间空一行
+        buf = io.StringIO()
+        write = buf.write
 
-        # 根据层级决定筛选策略
+        # 根据层级决定筛选策略，过滤与分组在同一次遍历中完成
         if level == 'base':
-            filtered_sources = sources
-            self.logger.info(f'基础层级TXT: 使用 {len(filtered_sources)} 个源')
-        else:
-            filtered_sources = self.enhanced_filter_sources(sources)
-            self.logger.info(f'高级层级TXT: 从 {len(sources)} 个源中筛选出 {len(filtered_sources)} 个合格源')
-
-        # 按增强分组对源进行排序和分组
-        grouped_sources = self.enhanced_group_and_sort_sources(filtered_sources, level)
+            self.logger.info(f'基础层级TXT: 使用 {len(sources)} 个源')
+        grouped_sources, kept, _ = self._filter_and_group(sources, apply_filter=level != 'base')
+        if level != 'base':
+            self.logger.info(f'高级层级TXT: 从 {len(sources)} 个源中筛选出 {kept} 个合格源')
 
         # 生成TXT内容
-        for group, group_sources in grouped_sources.items():
-            # 添加分组注释
-            output_lines.append(f'# {group}')
+        for index, (group, group_sources) in enumerate(grouped_sources.items()):
+            # 空行分隔不同分组，并添加分组注释
+            if index:
+                write('\n')
+            write(f'# {group}\n')
 
             for source in group_sources:
                 # 构建频道行
@@ -249,12 +410,10 @@ class M3UGenerator:
                     else:
                         channel_line = f'{source["name"]},{source["url"]}#User-Agent={source["user_agent"]}'
 
-                output_lines.append(channel_line)
-
-            # 添加空行分隔不同分组
-            output_lines.append('')
+                write(channel_line)
+                write('\n')
 
-        return '\n'.join(output_lines)
+        return buf.getvalue()
 
     def enhanced_filter_sources(self, sources: list[dict]) -> list[dict]:
         """增强版源过滤 - 用于高级层级筛选
@@ -265,72 +424,95 @@ class M3UGenerator:
         Returns:
             List[Dict]: 过滤后的源数据列表
         """
-        filtered = []
-        for source in sources:
+        passes = self._source_filter()
+        return [source for source in sources if passes(source)]
+
+    def _source_filter(self) -> Callable[[dict], bool]:
+        """构建高级层级的过滤谓词 source -> bool（阈值与分辨率检查计划在此一次算好）"""
+        # 阈值在循环外一次取成局部变量；分辨率检查计划（要做的上/下限检查及其解析结果）同样只与配置有关
+        params = self.filter_params
+        max_latency = params['max_latency']
+        min_bitrate = params['min_bitrate']
+        min_speed = params['min_speed']
+        must_hd = params['must_hd']
+        must_4k = params['must_4k']
+        min_resolution = params['min_resolution']
+        max_resolution = params['max_resolution']
+        resolution_filter_mode = params.get('resolution_filter_mode', 'range')
+        check_min = bool(min_resolution) and resolution_filter_mode in ('range', 'min_only')
+        check_max = bool(max_resolution) and resolution_filter_mode in ('range', 'max_only')
+        min_width, min_height = (_parse_resolution(min_resolution) or (0, 0)) if check_min else (0, 0)
+        max_width, max_height = (_parse_resolution(max_resolution) or (9999, 9999)) if check_max else (9999, 9999)
+        whitelist_force_keep = self.whitelist_force_keep
+        # 分辨率取值只有十来种：按字符串缓存整条上/下限检查的结论，每个不同取值只解析、比较一次
+        resolution_verdicts: dict[str, bool] = {}
+
+        def resolution_ok(resolution: str) -> bool:
+            # 无法解析时下限按 (0, 0)、上限按 (9999, 9999)
+            if check_min:
+                width, height = _parse_resolution(resolution) or (0, 0)
+                if width < min_width or height < min_height:
+                    return False
+            if check_max:
+                width, height = _parse_resolution(resolution) or (9999, 9999)
+                if width > max_width or height > max_height:
+                    return False
+            return True
+
+        def passes(source: dict) -> bool:
             # P2-⑥：白名单强制保留 —— 命中白名单的源跳过全部质量过滤直接保留
-            if self.whitelist_force_keep and self._matches_whitelist(source):
-                filtered.append(source)
-                continue
+            if whitelist_force_keep and self._matches_whitelist(source):
+                return True
 
-            # 基本状态检查
-            if source.get('status') != 'success':
-                continue
+            # 每个字段只取一次；数值字段为 None 时按缺省值处理（与排序键的 None 归一一致），
+            # 保证条件重排后不会因先比较到 None 而抛错
+            get = source.get
 
-            # 音频内容简化检查
-            media_type = source.get('media_type', 'video')
-            if media_type in ['radio', 'audio']:
-                # 音频只需要检查延迟
-                response_time = source.get('response_time', 9999)
-                if response_time <= self.filter_params['max_latency']:
-                    filtered.append(source)
-                continue
+            # 基本状态检查
+            if get('status') != 'success':
+                return False
+
+            # 音频内容简化检查：只需要检查延迟
+            response_time = get('response_time', 9999)
+            if response_time is None:
+                response_time = 9999
+            if get('media_type', 'video') in ('radio', 'audio'):
+                return response_time <= max_latency
+
+            # 视频内容详细检查：各条件是纯“与”关系，按开销从低到高排列，便宜的先淘汰
+            # 特殊要求检查（布尔开关）
+            if must_hd and not get('is_hd', False):
+                return False
+            if must_4k and not get('is_4k', False):
+                return False
 
-            # 视频内容详细检查
             # 延迟检查
-            response_time = source.get('response_time', 9999)
-            if response_time > self.filter_params['max_latency']:
-                continue
-
-            # 分辨率检查
-            min_resolution = self.filter_params['min_resolution']
-            max_resolution = self.filter_params['max_resolution']
-            resolution_filter_mode = self.filter_params.get('resolution_filter_mode', 'range')
-
-            if min_resolution or max_resolution:
-                resolution = source.get('resolution', '')
-
-                if resolution_filter_mode == 'range':
-                    if min_resolution and not self.is_resolution_meet_min(resolution, min_resolution):
-                        continue
-                    if max_resolution and not self.is_resolution_meet_max(resolution, max_resolution):
-                        continue
-                elif resolution_filter_mode == 'min_only':
-                    if min_resolution and not self.is_resolution_meet_min(resolution, min_resolution):
-                        continue
-                elif resolution_filter_mode == 'max_only':
-                    if max_resolution and not self.is_resolution_meet_max(resolution, max_resolution):
-                        continue
+            if response_time > max_latency:
+                return False
 
             # 比特率检查
-            bitrate = source.get('bitrate', 0)
-            if bitrate > 0 and bitrate < self.filter_params['min_bitrate']:
-                continue
-
-            # 特殊要求检查
-            if self.filter_params['must_hd'] and not source.get('is_hd', False):
-                continue
-
-            if self.filter_params['must_4k'] and not source.get('is_4k', False):
-                continue
+            bitrate = get('bitrate') or 0
+            if bitrate > 0 and bitrate < min_bitrate:
+                return False
 
             # M1: 速度检查 - 修复当 speed==0（未测速时）所有未测速源被丢弃的问题
-            speed = source.get('download_speed', 0)
-            if speed > 0 and speed < self.filter_params['min_speed']:
-                continue
+            speed = get('download_speed') or 0
+            if speed > 0 and speed < min_speed:
+                return False
+
+            # 分辨率检查放最后（需解析字符串）；空分辨率视为满足
+            if check_min or check_max:
+                resolution = get('resolution', '')
+                if resolution:
+                    ok = resolution_verdicts.get(resolution)
+                    if ok is None:
+                        ok = resolution_verdicts[resolution] = resolution_ok(resolution)
+                    if not ok:
+                        return False
 
-            filtered.append(source)
+            return True
 
-        return filtered
+        return passes
 
     def enhanced_group_and_sort_sources(self, sources: list[dict], level: str) -> dict[str, list[dict]]:
         """增强版分组和排序逻辑 - 修复None值问题
@@ -342,68 +524,91 @@ class M3UGenerator:
         Returns:
             Dict[str, List[Dict]]: 分组后的源数据
         """
-        group_by = self.output_params['group_by']
-        grouped = {}
+        return self._filter_and_group(sources)[0]
 
-        # 第一步：按媒体类型预分组
-        media_groups = {'video': [], 'audio': [], 'radio': []}
-        for source in sources:
-            media_type = source.get('media_type', 'video')
-            if media_type in media_groups:
-                media_groups[media_type].append(source)
-            else:
-                media_groups['video'].append(source)
+    def _filter_and_group(
+        self, sources: list[dict], apply_filter: bool = False, expand_multi: bool = False
+    ) -> tuple[dict[str, list[dict]], int, int]:
+        """过滤、多分类展开与分组合并为一次遍历，随后逐组排序
 
-        # 第二步：对每个媒体类型进行详细分组
-        for media_type, media_sources in media_groups.items():
-            if not media_sources:
+        Args:
+            sources: 源数据列表
+            apply_filter: 是否应用高级层级过滤（enhanced_filter_sources 的条件）
+            expand_multi: content 含逗号时是否复制频道到多个分组（M3U 用）
+
+        Returns:
+            (分组后的源数据, 过滤后源数, 展开后源数)
+        """
+        passes = self._source_filter() if apply_filter else None
+        group_key_of = _group_key_accessor(self.group_by)
+        # defaultdict：每个源只做一次分组键哈希查找（不再 get 后再判空插入）
+        grouped: collections.defaultdict[str, list[dict]] = collections.defaultdict(list)
+        audio_sources: list[dict] = []
+        radio_sources: list[dict] = []
+        # 媒体类型 → 暂存列表；视频（含缺省 media_type）查不到直接进分组，常见的纯视频数据每源只多一次查表
+        side_buckets = {'audio': audio_sources, 'radio': radio_sources}
+        side_bucket_of = side_buckets.get
+        kept = total = 0
+
+        # 单次遍历：视频按配置分组（分组顺序 = 首次出现顺序）；音频/收音机先暂存，排在全部视频分组之后
+        for source in sources:
+            if passes is not None and not passes(source):
                 continue
+            kept += 1
+
+            items: Sequence[dict] = (source,)
+            if expand_multi:
+                # ── 多分类展开：content 含逗号时复制频道到多个分组 ──
+                content_val = source.get('content', '') or ''
+                if ',' in content_val:
+                    copies = []
+                    for single_content in [c.strip() for c in content_val.split(',') if c.strip()]:
+                        s_copy = dict(source)
+                        s_copy['content'] = single_content
+                        s_copy['category'] = single_content
+                        copies.append(s_copy)
+                    items = copies
+
+            for item in items:
+                total += 1
+                side = side_bucket_of(item.get('media_type'))
+                if side is None:
+                    grouped[group_key_of(item)].append(item)
+                else:
+                    side.append(item)
 
-            if media_type == 'video':
-                # 视频内容按配置分组
-                for source in media_sources:
-                    group_key = self.get_group_key(source, group_by)
-                    if group_key not in grouped:
-                        grouped[group_key] = []
-                    grouped[group_key].append(source)
-            else:
-                # 音频内容特殊分组
-                audio_group_key = '收音机' if media_type == 'radio' else '在线音频'
-                if audio_group_key not in grouped:
-                    grouped[audio_group_key] = []
+        # 音频内容特殊分组（与同名视频分组合并时追加在其后）
+        for audio_group_key, media_sources in (('在线音频', audio_sources), ('收音机', radio_sources)):
+            if media_sources:
                 grouped[audio_group_key].extend(media_sources)
 
-        # 第三步：对每个分组内的源进行排序 - 修复None值问题
-        sort_by = (self.output_params.get('output_sort_by') or 'speed').lower()
+        # 对每个分组内的源排序 - 修复None值问题；排序键函数按 output_sort_by 只选一次
+        sort_by = self.output_sort_by
+        if sort_by == 'name':
+            video_sort_key = _name_sort_key
+        elif sort_by == 'resolution':
+            parse_height = self._parse_height
+
+            # 按分辨率高度降序（无分辨率沉底）
+            def video_sort_key(x):
+                return -(parse_height(x.get('resolution', '') or '')), x.get('name', '') or ''
+
+        else:
+            # 默认 speed：地域分桶 + 桶内数值键排序，见 _sort_by_speed
+            video_sort_key = None
+
         for group_key, group_sources in grouped.items():
-            # 根据媒体类型使用不同的排序策略
+            # 音频分组按名称排序，其余按配置的排序方式
             if '收音机' in group_key or '在线音频' in group_key:
-                # 音频按名称排序 - 修复None值问题
-                group_sources.sort(key=lambda x: x.get('name', '') or '')
-            elif sort_by == 'name':
-                group_sources.sort(key=lambda x: x.get('name', '') or '')
-            elif sort_by == 'resolution':
-                # 按分辨率高度降序（无分辨率沉底）
-                group_sources.sort(
-                    key=lambda x: (
-                        -(self._parse_height(x.get('resolution', '') or '')),
-                        x.get('name', '') or '',
-                    )
-                )
+                group_sources.sort(key=_name_sort_key)
+            elif video_sort_key is None:
+                _sort_by_speed(group_sources)
             else:
-                # 默认 speed：按测速降序 + 响应时间升序（快源在前）
-                group_sources.sort(
-                    key=lambda x: (
-                        x.get('continent', '') or '',
-                        x.get('country', '') or '',
-                        x.get('province', '') or '',
-                        -(x.get('download_speed', 0) or 0),  # 修复None值
-                        x.get('response_time', 9999) or 9999,  # 修复None值
-                        x.get('name', '') or '',
-                    )
-                )
-
-        return grouped
+                group_sources.sort(key=video_sort_key)
+
+        # 交给调用方前关闭缺省工厂：之后访问不存在的分组键照常抛 KeyError，不会悄悄插入空分组
+        grouped.default_factory = None
+        return grouped, kept, total
 
     def get_group_key(self, source: dict, group_by: str) -> str:
         """获取分组键
@@ -415,18 +620,7 @@ class M3UGenerator:
         Returns:
             str: 分组键
         """
-        if group_by == 'country':
-            return source.get('country', 'Unknown') or 'Unknown'
-        elif group_by == 'region':
-            return source.get('region', 'Unknown') or 'Unknown'
-        elif group_by == 'category':
-            return source.get('category', 'Unknown') or 'Unknown'
-        elif group_by == 'media_type':
-            return source.get('media_type', 'video') or 'video'
-        elif group_by == 'source':
-            return source.get('source_type', 'Unknown') or 'Unknown'
-        else:
-            return 'All Channels'
+        return _group_key_accessor(group_by)(source)
 
     def _build_group_title(self, source: dict) -> str:
         """根据配置的 group_title_format 构建分组标题
@@ -444,7 +638,7 @@ class M3UGenerator:
             str: 格式化后的分组标题
         """
         # 默认格式：仅主分类（向后兼容）
-        group_title_format = self.config.get('m3u_group_title_format', '')
+        group_title_format = self.group_title_format
 
         if not group_title_format:
             # 默认使用 content 维度作为 group-title
@@ -485,66 +679,70 @@ class M3UGenerator:
         Returns:
             str: EXTINF行内容
         """
-        parts = ['#EXTINF:-1']
+        # 每个字段只取一次到局部变量；可选属性先算成带前导空格的片段（缺省为空串），
+        # 最后由一个 f-string 一次拼出整行，不再逐段 append 到列表再 join
+        get = source.get
+        attr_escape = self._attr_escape
 
         # M2: 修复 source['name'] 可能 KeyError
-        channel_name = source.get('name', 'Unknown')
+        channel_name = get('name', 'Unknown')
         # 基本信息：优先使用频道映射中对齐到的 EPG tvg_id，否则回退 slug
         mapped = (tvg_map or {}).get(channel_name) or {}
-        slug_id = re.sub(r'[^a-zA-Z0-9]', '_', channel_name).lower()
-        tvg_id = self._attr_escape(mapped.get('tvg_id') or slug_id)
-        parts.append(f'tvg-id="{tvg_id}"')
-        parts.append(f'tvg-name="{self._attr_escape(channel_name)}"')
+        tvg_id = attr_escape(mapped.get('tvg_id') or _tvg_id(channel_name))
 
         # 图标：源自带 logo 优先；否则用 EPG 对齐到的 tvg_logo
-        logo = source.get('logo') or mapped.get('tvg_logo') or ''
-        if logo:
-            parts.append(f'tvg-logo="{self._attr_escape(logo)}"')
+        logo = get('logo') or mapped.get('tvg_logo') or ''
+        logo_attr = f' tvg-logo="{attr_escape(logo)}"' if logo else ''
 
         # 分组标题（支持多维格式化）
         group_title = self._build_group_title(source)
-        parts.append(f'group-title="{group_title}"')
 
         # 媒体类型信息
-        media_type = source.get('media_type', 'video')
-        parts.append(f'media-type="{media_type}"')
+        media_type = get('media_type', 'video')
 
         # 地区信息
-        if source.get('country'):
-            parts.append(f'tvg-country="{source["country"]}"')
-        if source.get('region'):
-            parts.append(f'tvg-region="{source["region"]}"')
-        if source.get('province'):
-            parts.append(f'tvg-province="{source["province"]}"')
+        country = get('country')
+        region = get('region')
+        province = get('province')
+        geo_attrs = (
+            (f' tvg-country="{country}"' if country else '')
+            + (f' tvg-region="{region}"' if region else '')
+            + (f' tvg-province="{province}"' if province else '')
+        )
 
         # UA信息
         ua_pos = self._resolve_ua_position(source)
-        if self.ua_enabled and ua_pos == 'extinf' and source.get('user_agent'):
-            parts.append(f'user-agent="{source["user_agent"]}"')
+        user_agent = get('user_agent')
+        ua_attr = f' user-agent="{user_agent}"' if self.ua_enabled and ua_pos == 'extinf' and user_agent else ''
 
         # 质量信息（根据层级决定详细程度）
+        quality_attrs = ''
         if level == 'qualified':
-            if source.get('response_time'):
-                parts.append(f'response-time="{source.get("response_time")}ms"')
-            speed = source.get('download_speed')
+            response_time = get('response_time')
+            if response_time:
+                quality_attrs = f' response-time="{response_time}ms"'
+            speed = get('download_speed')
             if speed is not None and speed > 0:
-                parts.append(f'download-speed="{speed:.1f}KB/s"')
+                quality_attrs += f' download-speed="{speed:.1f}KB/s"'
 
         # 技术信息
-        if source.get('resolution'):
-            parts.append(f'resolution="{source.get("resolution")}"')
-        if source.get('bitrate'):
-            parts.append(f'bitrate="{source.get("bitrate")}kbps"')
+        resolution = get('resolution')
+        bitrate = get('bitrate')
+        tech_attrs = (f' resolution="{resolution}"' if resolution else '') + (
+            f' bitrate="{bitrate}kbps"' if bitrate else ''
+        )
 
         # 状态信息
-        if source.get('status') != 'success':
-            parts.append(f'status="{source.get("status")}"')
+        status = get('status')
+        status_attr = f' status="{status}"' if status != 'success' else ''
 
         # 频道名称
         # 纪码修复 P1-4: 使用 .get('name', 'Unknown') 避免 KeyError
-        parts.append(f',{source.get("name", "Unknown")}')
-
-        return ' '.join(parts)
+        return (
+            f'#EXTINF:-1 tvg-id="{tvg_id}" tvg-name="{attr_escape(channel_name)}"{logo_attr}'
+            f' group-title="{group_title}" media-type="{media_type}"'
+            f'{geo_attrs}{ua_attr}{quality_attrs}{tech_attrs}{status_attr} ,{channel_name}'
+        )
 
     def is_resolution_meet_min(self, resolution: str, min_resolution: str) -> bool:
         """检查分辨率是否满足最低要求
@@ -559,26 +757,8 @@ class M3UGenerator:
         if not resolution or not min_resolution:
             return True
 
-        def parse_resolution(res):
-            """解析分辨率字符串为(宽度, 高度)元组"""
-            if 'x' in res:
-                parts = res.split('x')
-                if len(parts) == 2:
-                    try:
-                        return int(parts[0]), int(parts[1])
-                    except (ValueError, TypeError):
-                        return 0, 0
-            elif res.endswith('p'):
-                try:
-                    height = int(res[:-1])
-                    width = int(height * 16 / 9)  # 假设宽高比为16:9
-                    return width, height
-                except (ValueError, TypeError):
-                    return 0, 0
-            return 0, 0
-
-        res_width, res_height = parse_resolution(resolution)
-        min_width, min_height = parse_resolution(min_resolution)
+        res_width, res_height = _parse_resolution(resolution) or (0, 0)
+        min_width, min_height = _parse_resolution(min_resolution) or (0, 0)
 
         return res_width >= min_width and res_height >= min_height
 
@@ -595,26 +775,8 @@ class M3UGenerator:
         if not resolution or not max_resolution:
             return True
 
-        def parse_resolution(res):
-            """解析分辨率字符串为(宽度, 高度)元组"""
-            if 'x' in res:
-                parts = res.split('x')
-                if len(parts) == 2:
-                    try:
-                        return int(parts[0]), int(parts[1])
-                    except (ValueError, TypeError):
-                        return 9999, 9999
-            elif res.endswith('p'):
-                try:
-                    height = int(res[:-1])
-                    width = int(height * 16 / 9)  # 假设宽高比为16:9
-                    return width, height
-                except (ValueError, TypeError):
-                    return 9999, 9999
-            return 9999, 9999
-
-        res_width, res_height = parse_resolution(resolution)
-        max_width, max_height = parse_resolution(max_resolution)
+        res_width, res_height = _parse_resolution(resolution) or (9999, 9999)
+        max_width, max_height = _parse_resolution(max_resolution) or (9999, 9999)
 
         return res_width <= max_width and res_height <= max_height
 
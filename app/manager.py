@@ -17,11 +17,19 @@
 
 import asyncio
 import contextlib
+import functools
+import heapq
+import locale
+import logging
 import os
+import re
+import stat
 import sys
 import time
 import traceback
-from typing import ClassVar
+from collections import Counter, defaultdict
+from collections.abc import Callable
+from typing import BinaryIO, ClassVar
 
 from app.config import Config
 from app.exceptions import (
@@ -35,10 +43,163 @@ from app.exceptions import (
 )
 from app.logger import Logger
 from app.m3u_generator import M3UGenerator
-from app.rules import ChannelRules, get_channel_name_mapping_for_app
+from app.rules import get_channel_name_mapping_for_app, get_channel_rules
 from app.source_manager import SourceManager, dedup_sources_by_url
 from app.stream_tester import StreamTester
 
+# 收音机关键词 - 传统广播电台（与小写频道名比较；交通广播/音乐广播等复合词已被“广播”覆盖）
+_RADIO_KEYWORD_RE = re.compile('|'.join(map(re.escape, ('radio', '广播', '电台', 'fm', 'am'))))
+
+# 分辨率分组筛选：每个 (频道, 分辨率) 分组保留的源数；分组超过阈值时改用堆取前 K 个，避免整组排序
+_KEEP_PER_RESOLUTION_GROUP = 5
+_TOP_K_HEAP_THRESHOLD = 50
+
+# 输出目录写权限验证哨兵：记录上次验证时目录的 inode/权限/属主，有效期 1 天
+_PERMISSION_SENTINEL = '.permission_verified'
+_PERMISSION_SENTINEL_TTL = 24 * 3600
+
+# 输出目录的默认占位文件内容（防止空目录），导入时编码一次，写入时无需再编码
+_DEFAULT_M3U_BYTES = """#EXTM3U
+#EXTINF:-1 tvg-id="default" tvg-name="默认频道" group-title="系统消息",默认频道
+# 直播源管理工具正在处理中，请稍后刷新...
+https://example.com/default""".encode()
+
+_DEFAULT_TXT_BYTES = """# 直播源管理工具
+# 正在处理直播源，请稍后刷新...
+默认频道,https://example.com/default""".encode()
+
+# 与 _output_file_paths 返回的 (M3U, TXT) 路径一一对应
+_DEFAULT_FILES = ((_DEFAULT_M3U_BYTES, 'M3U'), (_DEFAULT_TXT_BYTES, 'TXT'))
+
+
+def _stat_output_dir(path: str) -> os.stat_result:
+    """stat 输出目录，不存在时先创建
+
+    目录已存在是常见情况，只需一次 stat（makedirs(exist_ok=True) 每次都要 mkdir 失败后再 stat）；
+    路径存在但不是目录时抛出 NotADirectoryError。
+    """
+    try:
+        dir_stat = os.stat(path)
+    except FileNotFoundError:
+        os.makedirs(path, exist_ok=True)
+        dir_stat = os.stat(path)
+    if not stat.S_ISDIR(dir_stat.st_mode):
+        raise NotADirectoryError(f'输出路径不是目录: {path}')
+    return dir_stat
+
+
+# 输出文件权限（确保Nginx可读）
+_OUTPUT_FILE_MODE = 0o644
+
+
+def _fchmod_output(fd: int):
+    """在已打开的文件描述符上设置输出文件权限（不受 umask 影响，免去事后按路径 chmod）
+
+    Python 3.13 之前的 Windows 没有 os.fchmod，而其 chmod 对 0o644 本就只是清除只读位，跳过即可。
+    """
+    if hasattr(os, 'fchmod'):
+        os.fchmod(fd, _OUTPUT_FILE_MODE)
+
+
+def _print_log(level: str, message: str, *args):
+    """未配置 logger 时的日志回退：直接打印（与 logging 一致，支持 %s 惰性参数）"""
+    print(f'{level}: {message % args if args else message}')
+
+
+def _discard_log(message: str, *args):
+    """未配置 logger 时丢弃调试日志"""
+
+
+@functools.lru_cache(maxsize=16)
+def _output_file_paths(output_dir: str, filename: str, prefix: str = '') -> tuple[str, str]:
+    """按输出目录、配置文件名与层级前缀拼出 (M3U 路径, TXT 路径)
+
+    每次运行的取值只有寥寥几组（默认文件、基础/高级两级列表），按参数缓存，重复准备目录或重试时直接复用。
+    """
+    base_filename = filename.removesuffix('.m3u')
+    return (
+        os.path.join(output_dir, f'{prefix}{base_filename}.m3u'),
+        os.path.join(output_dir, f'{prefix}{base_filename}.txt'),
+    )
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_resolution(res: str) -> tuple[int, int]:
+    """将分辨率字符串解析为(宽度, 高度)元组，无法解析时返回 (0, 0)
+
+    支持 "1920x1080" 与 "1080p"（按 16:9 推算宽度）；分辨率取值高度重复，按字符串缓存。
+    """
+    if not res:
+        return 0, 0
+
+    if 'x' in res:
+        # 格式: "1920x1080"
+        parts = res.split('x')
+        if len(parts) == 2:
+            try:
+                return int(parts[0]), int(parts[1])
+            except (ValueError, TypeError):
+                return 0, 0
+    elif res.endswith('p'):
+        # 格式: "1080p"
+        try:
+            height = int(res[:-1])
+            # 假设宽高比为16:9计算宽度
+            width = int(height * 16 / 9)
+            return width, height
+        except (ValueError, TypeError):
+            return 0, 0
+    return 0, 0
+
+
+def _resolution_within(resolution: str, min_wh: tuple[int, int], max_wh: tuple[int, int], mode: str) -> bool:
+    """按已解析的上下限检查分辨率（(0, 0) 表示不限）；未知分辨率默认通过"""
+    if not resolution or resolution == 'unknown':
+        return True
+
+    res_w, res_h = _parse_resolution(resolution)
+    min_w, min_h = min_wh
+    max_w, max_h = max_wh
+
+    if mode == 'range':
+        # 必须同时满足最小和最大分辨率
+        min_ok = (min_w == 0 and min_h == 0) or (res_w >= min_w and res_h >= min_h)
+        max_ok = (max_w == 0 and max_h == 0) or (res_w <= max_w and res_h <= max_h)
+        return min_ok and max_ok
+    elif mode == 'min_only':
+        # 只检查最低分辨率
+        return (min_w == 0 and min_h == 0) or (res_w >= min_w and res_h >= min_h)
+    elif mode == 'max_only':
+        # 只检查最高分辨率
+        return (max_w == 0 and max_h == 0) or (res_w <= max_w and res_h <= max_h)
+
+    return True
+
+
+def _resolution_group_key(source: dict) -> tuple:
+    """分辨率分组键：音频按频道名称分组（不区分分辨率）为 (名称,)，视频为 (名称, 分辨率)
+
+    元组键免去逐源拼接字符串；长度不同的元组键互不冲突。
+    """
+    if source.get('media_type', 'video') in ('radio', 'audio'):
+        return (source['name'],)
+    return source['name'], source.get('resolution', 'unknown')
+
+
+def _quality_rank_key(source: dict) -> tuple:
+    """分辨率分组内的质量排序键（响应时间 + 下载速度 + 比特率）- 修复None值问题
+
+    数值统一转成 float：指标常见 int 与 float 混杂，键内同位置类型一致时
+    list.sort 才会走 float 专用比较快路径；模块级函数也免去每个分组新建 lambda。
+    """
+    get = source.get
+    return (
+        -float(get('download_speed', 0) or 0),  # 速度降序（越高越好）
+        float(get('response_time', 9999) or 9999),  # 延迟升序（越低越好）
+        -float(get('bitrate', 0) or 0),  # 比特率降序（越高越好）
+        get('name', '') or '',  # 名称升序（稳定排序）
+    )
+
 
 class EnhancedLiveSourceManager:
     """增强版直播源管理器 - 支持分层筛选和智能分类（修复版）
@@ -124,6 +285,9 @@ class EnhancedLiveSourceManager:
         self.last_run_time = 0.0
         self.last_run_success = False
         self._initialized = False  # 纪枢 A-4: 初始化完成标志
+        # 按频道名缓存分类结果：(映射表覆盖分类, 规则引擎基础信息, 规则分类)。
+        # 同名频道往往有几十个源，映射表查库与规则引擎对每个名称只走一次；每轮分层筛选开始时清空，保证规则/映射修改在下一轮生效
+        self._classify_cache: dict[str, tuple[str | None, dict, str]] = {}
 
     def initialize(self) -> bool:
         """初始化所有组件 - 增强错误处理版
@@ -165,7 +329,7 @@ class EnhancedLiveSourceManager:
 
             # 第四步：初始化频道规则管理器
             self.logger_info('初始化频道规则管理器...')
-            self.channel_rules = ChannelRules()
+            self.channel_rules = get_channel_rules()
 
             # 第五步：测试频道分类规则
             if not self._test_channel_rules():
@@ -242,27 +406,38 @@ class EnhancedLiveSourceManager:
         """
         try:
             output_dir = self.config.get_output_params()['output_dir']
-            self.logger_info(f'验证Nginx输出目录: {output_dir}')
+            self.logger_info('验证Nginx输出目录: %s', output_dir)
 
-            # 确保目录存在
-            os.makedirs(output_dir, exist_ok=True)
+            # 确保目录存在（同时取得目录 stat，供下方哨兵比对）
+            dir_stat = _stat_output_dir(output_dir)
 
             # 检查写权限
             if not os.access(output_dir, os.W_OK):
                 self.logger_warning(f'输出目录不可写，尝试修复权限: {output_dir}')
                 try:
                     os.chmod(output_dir, 0o755)
+                    dir_stat = os.stat(output_dir)
                     self.logger_info('✓ 目录权限修复成功')
                 except Exception as e:
                     self.logger_error(f'✗ 目录权限修复失败: {e}')
                     return False
 
-            # 验证Nginx用户访问权限（通过测试文件）
-            test_file = os.path.join(output_dir, '.permission_test')
+            # 验证Nginx用户访问权限：哨兵文件记录目录的 inode/权限/属主，目录未变且哨兵未过期时
+            # 沿用上次结果；否则写入哨兵本身即完成写权限测试（不再每次创建后删除测试文件）
+            stamp = f'{dir_stat.st_ino}:{dir_stat.st_mode}:{dir_stat.st_uid}:{dir_stat.st_gid}'
+            sentinel = os.path.join(output_dir, _PERMISSION_SENTINEL)
+            try:
+                if time.time() - os.stat(sentinel).st_mtime < _PERMISSION_SENTINEL_TTL:
+                    with open(sentinel, encoding='utf-8') as f:
+                        if f.read() == stamp:
+                            self.logger_info('✓ Nginx目录权限验证通过（目录未变化，沿用上次验证结果）')
+                            return True
+            except OSError:
+                pass
+
             try:
-                with open(test_file, 'w') as f:
-                    f.write('test')
-                os.remove(test_file)
+                with open(sentinel, 'w', encoding='utf-8') as f:
+                    f.write(stamp)
                 self.logger_info('✓ Nginx目录权限验证通过')
                 return True
             except Exception as e:
@@ -322,50 +497,11 @@ class EnhancedLiveSourceManager:
         # M3: 修复 source['name'] 可能 KeyError
         channel_name = source.get('name', '').lower()
 
-        # 收音机关键词 - 传统广播电台
-        radio_keywords = [
-            'radio',
-            '广播',
-            '电台',
-            'fm',
-            'am',
-            '交通广播',
-            '音乐广播',
-            '新闻广播',
-            '经济广播',
-            '文艺广播',
-            '都市广播',
-            '农村广播',
-        ]
-
-        # 在线音频关键词 - 网络音频内容
-        audio_keywords = [
-            'music',
-            '音乐',
-            '歌曲',
-            'mtv',
-            '演唱会',
-            '音乐会',
-            '有声',
-            '听书',
-            '相声',
-            '小品',
-            '朗诵',
-            '配音',
-            '音效',
-            'asmr',
-            '播客',
-        ]
-
-        # 优先匹配收音机关键词
-        if any(keyword in channel_name for keyword in radio_keywords):
+        # 优先匹配收音机关键词（预编译交替正则，一次 C 层扫描）；
+        # 在线音频关键词命中与否结果相同，未命中收音机的一律归为在线音频
+        if _RADIO_KEYWORD_RE.search(channel_name):
             return 'radio'
-        # 其次匹配在线音频关键词
-        elif any(keyword in channel_name for keyword in audio_keywords):
-            return 'audio'
-        else:
-            # 默认归为在线音频
-            return 'audio'
+        return 'audio'
 
     def enhance_channel_classification(self, source: dict) -> dict:
         """增强频道分类 - 修复版
@@ -384,17 +520,23 @@ class EnhancedLiveSourceManager:
         """
         channel_name = source.get('name', '')
 
-        # 第一步：检查 channel_name_mapping 权威数据
-        mapping_override = None
-        try:
-            mapping = get_channel_name_mapping_for_app(channel_name)
-            if mapping and mapping.get('content', '其他频道') != '其他频道':
-                mapping_override = mapping['content']
-        except Exception:
-            pass
+        cached = self._classify_cache.get(channel_name)
+        if cached is None:
+            # 第一步：检查 channel_name_mapping 权威数据
+            mapping_override = None
+            try:
+                mapping = get_channel_name_mapping_for_app(channel_name)
+                if mapping and mapping.get('content', '其他频道') != '其他频道':
+                    mapping_override = mapping['content']
+            except Exception:
+                pass
 
-        # 调用规则引擎进行分类
-        enhanced_info = self.channel_rules.extract_channel_info(channel_name) if channel_name else {}
+            # 调用规则引擎进行分类
+            enhanced_info = self.channel_rules.extract_channel_info(channel_name) if channel_name else {}
+            rule_category = self.channel_rules.determine_category(channel_name)
+            self._classify_cache[channel_name] = (mapping_override, enhanced_info, rule_category)
+        else:
+            mapping_override, enhanced_info, rule_category = cached
 
         # 合并基础信息（国家、地区、语言等）
         source.update(enhanced_info)
@@ -404,17 +546,20 @@ class EnhancedLiveSourceManager:
 
         # 判断是否应该用规则分类覆盖现有分类
         # 如果映射表存在，映射表优先
+        # 每个源都会走到这里：调试日志未开启时不格式化 f-string
+        debug_on = self._debug_enabled()
         if mapping_override and mapping_override != current_category:
             source['category'] = mapping_override
-            self.logger_debug(f"分类覆盖(映射表): '{channel_name}' [{current_category} → {mapping_override}]")
+            if debug_on:
+                self.logger_debug(f"分类覆盖(映射表): '{channel_name}' [{current_category} → {mapping_override}]")
         else:
-            rule_category = self.channel_rules.determine_category(channel_name)
             should_override = self._should_override_category(rule_category, current_category, channel_name)
 
             if should_override:
                 source['category'] = rule_category
-                self.logger_debug(f"分类覆盖(规则引擎): '{channel_name}' [{current_category} → {rule_category}]")
-            else:
+                if debug_on:
+                    self.logger_debug(f"分类覆盖(规则引擎): '{channel_name}' [{current_category} → {rule_category}]")
+            elif debug_on:
                 self.logger_debug(f"保留原分类: '{channel_name}' [{current_category}]")
 
         # 媒体类型分类
@@ -442,24 +587,26 @@ class EnhancedLiveSourceManager:
         if old_cat == '其他频道':
             return True
 
-        # 如果新分类是兜底分类，不覆盖
-        if new_cat == '其他频道':
+        # 如果新分类是兜底分类，或与原分类相同（最常见的情况），不覆盖
+        if new_cat == '其他频道' or new_cat == old_cat:
             return False
 
         # 使用类级分类优先级常量（数值越小优先级越高）
-        new_priority = self.CATEGORY_PRIORITY.get(new_cat, 50)
-        old_priority = self.CATEGORY_PRIORITY.get(old_cat, 50)
+        priority = self.CATEGORY_PRIORITY
+        new_priority = priority.get(new_cat, 50)
+        old_priority = priority.get(old_cat, 50)
 
         # 新分类优先级更高（数值更小）则覆盖
         if new_priority < old_priority:
             return True
 
-        # 特殊规则：如果频道名称包含卫视但原分类不是卫视频道，则覆盖
-        if '卫视' in channel_name and old_cat != '卫视频道' and new_cat == '卫视频道':
-            return True
+        # 特殊规则（先比分类这种廉价条件，再扫描频道名；此处已保证 new_cat != old_cat）：
+        # 如果频道名称包含卫视但原分类不是卫视频道，则覆盖
+        if new_cat == '卫视频道':
+            return '卫视' in channel_name
 
-        # 特殊规则：如果频道名称包含CCTV但原分类不是央视频道，则覆盖
-        return bool('CCTV' in channel_name.upper() and old_cat != '央视频道' and new_cat == '央视频道')
+        # 如果频道名称包含CCTV但原分类不是央视频道，则覆盖
+        return new_cat == '央视频道' and 'CCTV' in channel_name.upper()
 
     def hierarchical_filtering(self, sources: list[dict]) -> tuple[list[dict], list[dict], list[dict]]:
         """分层筛选机制 - 核心处理流程
@@ -488,37 +635,41 @@ class EnhancedLiveSourceManager:
             self.logger_error('✗ 没有有效的源可供处理')
             return [], [], []
 
-        # 增强分类处理
+        # 增强分类处理：分类的同一次遍历中顺带完成第二层的 (频道, 分辨率) 分组
         self.logger_info('=== 智能分类处理 ===')
+        self._classify_cache.clear()
         classified_sources = []
-        classification_stats = {}
+        classification_stats = Counter()
+        channel_groups: defaultdict[tuple, list[dict]] = defaultdict(list)
 
         for source in valid_sources:
             try:
                 enhanced_source = self.enhance_channel_classification(source)
-                classified_sources.append(enhanced_source)
 
                 # 统计分类结果
                 category = enhanced_source.get('category', '未知')
-                classification_stats[category] = classification_stats.get(category, 0) + 1
+                classification_stats[category] += 1
 
             except Exception as e:
                 self.logger_warning(f'分类处理失败 {source["name"]}: {e}')
-                classified_sources.append(source)  # 保留原始源
+                enhanced_source = source  # 保留原始源
+
+            classified_sources.append(enhanced_source)
+            channel_groups[_resolution_group_key(enhanced_source)].append(enhanced_source)
 
         # 输出分类统计
         self.logger_info('分类统计:')
-        for category, count in sorted(classification_stats.items(), key=lambda x: x[1], reverse=True):
+        for category, count in classification_stats.most_common():
             self.logger_info(f'  {category}: {count} 个')
 
-        # 第二层：按分辨率分组筛选
+        # 第二层：按分辨率分组筛选；第三层条件筛选在挑选各组最佳源的同一次遍历中完成
         self.logger_info('=== 第二层: 分辨率分组筛选 ===')
-        base_sources = self.resolution_based_filtering(classified_sources)
+        qualifies = self._qualification_filter(self.config.get_filter_params())
+        base_sources, qualified_sources = self._select_best_per_group(channel_groups, qualifies)
         self.logger_info(f'分辨率分组筛选完成: {len(base_sources)} 个基础源')
 
         # 第三层：条件筛选
         self.logger_info('=== 第三层: 条件筛选 ===')
-        qualified_sources = self.condition_based_filtering(base_sources)
         self.logger_info(f'条件筛选完成: {len(qualified_sources)} 个合格源')
 
         return classified_sources, base_sources, qualified_sources
@@ -536,51 +687,43 @@ class EnhancedLiveSourceManager:
         Returns:
             List[Dict]: 分辨率筛选后的源列表
         """
-        # 按频道名称和分辨率分组
-        channel_groups = {}
-
+        # 按频道名称和分辨率分组：defaultdict 每源只做一次哈希查找
+        channel_groups: defaultdict[tuple, list[dict]] = defaultdict(list)
         for source in sources:
-            media_type = source.get('media_type', 'video')
+            channel_groups[_resolution_group_key(source)].append(source)
 
-            if media_type in ['radio', 'audio']:
-                # 音频内容：按频道名称分组（不区分分辨率）
-                channel_key = f'audio_{source["name"]}'
-                if channel_key not in channel_groups:
-                    channel_groups[channel_key] = []
-                channel_groups[channel_key].append(source)
-                continue
+        return self._select_best_per_group(channel_groups)[0]
 
-            # 视频内容：按频道名称和分辨率分组
-            resolution = source.get('resolution', 'unknown')
-            channel_key = f'{source["name"]}_{resolution}'
+    def _select_best_per_group(
+        self, channel_groups: dict[tuple, list[dict]], qualifies: Callable[[dict], bool] | None = None
+    ) -> tuple[list[dict], list[dict]]:
+        """对每个分组进行质量排序并保留前5个；给出 qualifies 时顺带挑出其中的合格源
 
-            if channel_key not in channel_groups:
-                channel_groups[channel_key] = []
-            channel_groups[channel_key].append(source)
-
-        # 对每个分组进行质量排序并保留前5个
+        Returns:
+            (各组保留的基础源, 其中满足 qualifies 的合格源；未给 qualifies 时为空列表)
+        """
         filtered_sources = []
+        qualified_sources = []
+        debug_on = self._debug_enabled()
 
         for channel_key, group_sources in channel_groups.items():
-            # 按质量排序（响应时间 + 下载速度 + 比特率）- 修复None值问题
-            sorted_sources = sorted(
-                group_sources,
-                key=lambda x: (
-                    -(x.get('download_speed', 0) or 0),  # 速度降序（越高越好）- 修复None值
-                    x.get('response_time', 9999) or 9999,  # 延迟升序（越低越好）- 修复None值
-                    -(x.get('bitrate', 0) or 0),  # 比特率降序（越高越好）- 修复None值
-                    x.get('name', '') or '',  # 名称升序（稳定排序）- 修复None值
-                ),
-            )
-
-            # 保留前5个质量最好的源
-            keep_count = min(5, len(sorted_sources))
-            filtered_sources.extend(sorted_sources[:keep_count])
+            group_size = len(group_sources)
+            # 保留前5个质量最好的源（响应时间 + 下载速度 + 比特率）- 修复None值问题；
+            # 大分组只需前 K 个，用堆做部分选择（O(M log K)），小分组整体排序更快。两者结果一致（同键保持原序）
+            keep_count = min(_KEEP_PER_RESOLUTION_GROUP, group_size)
+            if group_size > _TOP_K_HEAP_THRESHOLD:
+                kept = heapq.nsmallest(keep_count, group_sources, key=_quality_rank_key)
+            else:
+                kept = sorted(group_sources, key=_quality_rank_key)[:keep_count]
+            filtered_sources.extend(kept)
+            if qualifies is not None:
+                qualified_sources.extend(source for source in kept if qualifies(source))
 
-            if len(sorted_sources) > keep_count:
-                self.logger_debug(f"分组 '{channel_key}': 保留 {keep_count}/{len(sorted_sources)} 个源")
+            if debug_on and group_size > keep_count:
+                group_label = f'audio_{channel_key[0]}' if len(channel_key) == 1 else '{}_{}'.format(*channel_key)
+                self.logger_debug(f"分组 '{group_label}': 保留 {keep_count}/{group_size} 个源")
 
-        return filtered_sources
+        return filtered_sources, qualified_sources
 
     def condition_based_filtering(self, sources: list[dict]) -> list[dict]:
         """基于条件的筛选 - 应用配置参数
@@ -591,75 +734,105 @@ class EnhancedLiveSourceManager:
         Returns:
             List[Dict]: 条件筛选后的合格源列表
         """
-        filter_params = self.config.get_filter_params()
-        filtered_sources = []
-
-        for source in sources:
-            if self.is_source_qualified(source, filter_params):
-                filtered_sources.append(source)
+        # 谓词只构建一次（阈值、分辨率上下限在循环外取好），整批源一次推导式过滤
+        qualifies = self._qualification_filter(self.config.get_filter_params())
+        return [source for source in sources if qualifies(source)]
 
-        return filtered_sources
-
-    def is_source_qualified(self, source: dict, filter_params: dict) -> bool:
+    def is_source_qualified(
+        self,
+        source: dict,
+        filter_params: dict,
+        resolution_bounds: tuple[tuple[int, int], tuple[int, int]] | None = None,
+    ) -> bool:
         """检查源是否满足筛选条件 - 增强版
 
         Args:
             source: 源数据字典
             filter_params: 过滤参数配置
+            resolution_bounds: 预先解析好的 ((最低宽, 最低高), (最高宽, 最高高))，缺省时按 filter_params 现场解析
 
         Returns:
             bool: 是否合格
         """
-        # 基本状态检查
-        if source.get('status') != 'success':
-            return False
+        return self._qualification_filter(filter_params, resolution_bounds)(source)
+
+    def _qualification_filter(
+        self, filter_params: dict, resolution_bounds: tuple[tuple[int, int], tuple[int, int]] | None = None
+    ) -> Callable[[dict], bool]:
+        """构建条件筛选谓词 source -> bool（配置阈值与分辨率上下限在此一次取成局部变量）"""
+        max_latency = filter_params['max_latency']
+        min_bitrate = filter_params['min_bitrate']
+        min_speed = filter_params['min_speed']
+        must_hd = filter_params['must_hd']
+        must_4k = filter_params['must_4k']
+        resolution_mode = filter_params.get('resolution_filter_mode', 'range')
+        # 分辨率上下限来自配置，整轮不变：在循环外解析一次
+        if resolution_bounds is None:
+            resolution_bounds = (
+                _parse_resolution(filter_params['min_resolution']),
+                _parse_resolution(filter_params['max_resolution']),
+            )
+        min_wh, max_wh = resolution_bounds
+        # 调试日志未开启时连 f-string 都不格式化（被淘汰的源可能成千上万）
+        debug_on = self._debug_enabled()
+        logger_debug = self.logger_debug
 
-        # 延迟检查
-        response_time = source.get('response_time', 9999)
-        if response_time > filter_params['max_latency']:
-            self.logger_debug(f'延迟不合格: {source["name"]} ({response_time}ms)')
-            return False
+        def qualifies(source: dict) -> bool:
+            get = source.get
 
-        # 音频内容简化检查
-        media_type = source.get('media_type', 'video')
-        if media_type in ['radio', 'audio']:
-            # 音频只需要检查基本连通性和延迟
-            return response_time <= filter_params['max_latency']
+            # 基本状态检查
+            if get('status') != 'success':
+                return False
 
-        # 视频内容详细检查
+            # 延迟检查
+            response_time = get('response_time', 9999)
+            if response_time > max_latency:
+                if debug_on:
+                    logger_debug(f'延迟不合格: {source["name"]} ({response_time}ms)')
+                return False
 
-        # 分辨率检查
-        resolution = source.get('resolution', '')
-        min_res = filter_params['min_resolution']
-        max_res = filter_params['max_resolution']
-        resolution_mode = filter_params.get('resolution_filter_mode', 'range')
+            # 音频内容简化检查
+            if get('media_type', 'video') in ('radio', 'audio'):
+                # 音频只需要检查基本连通性和延迟
+                return response_time <= max_latency
 
-        if not self.check_resolution(resolution, min_res, max_res, resolution_mode):
-            self.logger_debug(f'分辨率不合格: {source["name"]} ({resolution})')
-            return False
+            # 视频内容详细检查：各条件是纯“与”关系，按开销从低到高排列
 
-        # 比特率检查
-        bitrate = source.get('bitrate', 0)
-        if bitrate > 0 and bitrate < filter_params['min_bitrate']:
-            self.logger_debug(f'比特率不合格: {source["name"]} ({bitrate}kbps)')
-            return False
+            # 特殊要求检查：配置开关关闭时短路，根本不读 is_hd/is_4k
+            if must_hd and not get('is_hd', False):
+                if debug_on:
+                    logger_debug(f'非高清源: {source["name"]}')
+                return False
 
-        # 特殊要求检查
-        if filter_params['must_hd'] and not source.get('is_hd', False):
-            self.logger_debug(f'非高清源: {source["name"]}')
-            return False
+            if must_4k and not get('is_4k', False):
+                if debug_on:
+                    logger_debug(f'非4K源: {source["name"]}')
+                return False
 
-        if filter_params['must_4k'] and not source.get('is_4k', False):
-            self.logger_debug(f'非4K源: {source["name"]}')
-            return False
+            # 比特率检查
+            bitrate = get('bitrate', 0)
+            if bitrate > 0 and bitrate < min_bitrate:
+                if debug_on:
+                    logger_debug(f'比特率不合格: {source["name"]} ({bitrate}kbps)')
+                return False
 
-        # 速度检查
-        speed = source.get('download_speed', 0)
-        if speed > 0 and speed < filter_params['min_speed']:
-            self.logger_debug(f'速度不合格: {source["name"]} ({speed:.1f}KB/s)')
-            return False
+            # 分辨率检查（需解析字符串）
+            resolution = get('resolution', '')
+            if not _resolution_within(resolution, min_wh, max_wh, resolution_mode):
+                if debug_on:
+                    logger_debug(f'分辨率不合格: {source["name"]} ({resolution})')
+                return False
 
-        return True
+            # 速度检查
+            speed = get('download_speed', 0)
+            if speed > 0 and speed < min_speed:
+                if debug_on:
+                    logger_debug(f'速度不合格: {source["name"]} ({speed:.1f}KB/s)')
+                return False
+
+            return True
+
+        return qualifies
 
     def check_resolution(self, resolution: str, min_res: str, max_res: str, mode: str) -> bool:
         """检查分辨率是否符合要求
@@ -673,50 +846,7 @@ class EnhancedLiveSourceManager:
         Returns:
             bool: 是否满足要求
         """
-        if not resolution or resolution == 'unknown':
-            return True  # 未知分辨率默认通过
-
-        def parse_resolution(res):
-            """将分辨率字符串解析为(宽度, 高度)元组"""
-            if not res:
-                return 0, 0
-
-            if 'x' in res:
-                # 格式: "1920x1080"
-                parts = res.split('x')
-                if len(parts) == 2:
-                    try:
-                        return int(parts[0]), int(parts[1])
-                    except (ValueError, TypeError):
-                        return 0, 0
-            elif res.endswith('p'):
-                # 格式: "1080p"
-                try:
-                    height = int(res[:-1])
-                    # 假设宽高比为16:9计算宽度
-                    width = int(height * 16 / 9)
-                    return width, height
-                except (ValueError, TypeError):
-                    return 0, 0
-            return 0, 0
-
-        res_w, res_h = parse_resolution(resolution)
-        min_w, min_h = parse_resolution(min_res)
-        max_w, max_h = parse_resolution(max_res)
-
-        if mode == 'range':
-            # 必须同时满足最小和最大分辨率
-            min_ok = (min_w == 0 and min_h == 0) or (res_w >= min_w and res_h >= min_h)
-            max_ok = (max_w == 0 and max_h == 0) or (res_w <= max_w and res_h <= max_h)
-            return min_ok and max_ok
-        elif mode == 'min_only':
-            # 只检查最低分辨率
-            return (min_w == 0 and min_h == 0) or (res_w >= min_w and res_h >= min_h)
-        elif mode == 'max_only':
-            # 只检查最高分辨率
-            return (max_w == 0 and max_h == 0) or (res_w <= max_w and res_h <= max_h)
-
-        return True
+        return _resolution_within(resolution, _parse_resolution(min_res), _parse_resolution(max_res), mode)
 
     async def enhanced_process_sources(self) -> bool:
         """增强的处理流程 - 支持分层筛选
@@ -770,21 +900,23 @@ class EnhancedLiveSourceManager:
             self.logger_info('=== 步骤5: 生成播放列表文件 ===')
             generator = M3UGenerator(self.config, self.logger)
 
-            # 生成基础播放列表（第二层筛选结果）
-            if base_sources:
-                success = self._generate_enhanced_playlist(generator, base_sources, '', '基础')
-                if not success:
-                    self.logger_error('生成基础播放列表文件失败')
-            else:
-                self.logger_warning('没有基础源，跳过基础播放列表文件生成')
+            # 基础 → 高级两份列表在同一轮内生成：高级列表复用基础列表已构建的 EXTINF，本轮结束即丢弃缓存
+            with generator.extinf_cache_round():
+                # 生成基础播放列表（第二层筛选结果）
+                if base_sources:
+                    success = self._generate_enhanced_playlist(generator, base_sources, '', '基础')
+                    if not success:
+                        self.logger_error('生成基础播放列表文件失败')
+                else:
+                    self.logger_warning('没有基础源，跳过基础播放列表文件生成')
 
-            # 生成高级播放列表（第三层筛选结果）
-            if qualified_sources:
-                success = self._generate_enhanced_playlist(generator, qualified_sources, 'qualified_', '高级')
-                if not success:
-                    self.logger_error('生成高级播放列表文件失败')
-            else:
-                self.logger_warning('没有合格源，跳过高级播放列表文件生成')
+                # 生成高级播放列表（第三层筛选结果）
+                if qualified_sources:
+                    success = self._generate_enhanced_playlist(generator, qualified_sources, 'qualified_', '高级')
+                    if not success:
+                        self.logger_error('生成高级播放列表文件失败')
+                else:
+                    self.logger_warning('没有合格源，跳过高级播放列表文件生成')
 
             # 步骤6: 输出统计信息
             self.logger_info('=== 步骤6: 生成统计信息 ===')
@@ -827,58 +959,54 @@ class EnhancedLiveSourceManager:
             bool: 生成是否成功
         """
         try:
-            # 生成M3U文件内容 - 添加异常捕获
+            # 获取基础文件名，直接写入到输出目录（输出参数每次操作只取一次）
+            output_params = self.config.get_output_params()
+            output_dir = output_params['output_dir']
+            os.makedirs(output_dir, exist_ok=True)
+            m3u_final_path, txt_final_path = _output_file_paths(output_dir, output_params['filename'], prefix)
+
+            # 原子写入M3U文件（避免写入过程中文件不完整）：内容直接流式写入临时文件，不在内存中拼出整份 M3U
+            m3u_temp_path = f'{m3u_final_path}.tmp'
+
+            # 生成M3U文件 - 添加异常捕获（失败时覆盖写入已写出一半的临时文件）
+            # 文件权限（确保Nginx可读）在写临时文件时经 fchmod 设定，替换后的正式文件即带正确权限
             try:
-                m3u_content = generator.generate_m3u(sources)
+                generator.generate_enhanced_m3u_to_file(sources, m3u_temp_path, mode=_OUTPUT_FILE_MODE)
             except Exception as e:
                 self.logger_error(f'生成M3U内容失败: {e}')
                 # 生成一个简单的备份M3U文件
-                m3u_content = self._create_backup_m3u_content(sources, level)
+                with open(m3u_temp_path, 'wb') as f:
+                    _fchmod_output(f.fileno())
+                    self._write_backup_m3u(sources, level, f)
+            os.replace(m3u_temp_path, m3u_final_path)
 
             # 生成TXT文件内容 - 添加异常捕获
             try:
-                txt_content = generator.generate_txt(sources)
+                txt_bytes = generator.generate_txt(sources).encode('utf-8')
             except Exception as e:
                 self.logger_error(f'生成TXT内容失败: {e}')
-                # 生成一个简单的备份TXT文件
-                txt_content = self._create_backup_txt_content(sources, level)
-
-            # 获取基础文件名
-            base_filename = self.config.get_output_params()['filename'].replace('.m3u', '')
-
-            # 直接写入到输出目录
-            output_dir = self.config.get_output_params()['output_dir']
-            os.makedirs(output_dir, exist_ok=True)
-
-            # 原子写入M3U文件（避免写入过程中文件不完整）
-            m3u_filename = f'{prefix}{base_filename}.m3u'
-            m3u_final_path = os.path.join(output_dir, m3u_filename)
-            m3u_temp_path = f'{m3u_final_path}.tmp'
-
-            with open(m3u_temp_path, 'w', encoding='utf-8') as f:
-                f.write(m3u_content)
-            os.replace(m3u_temp_path, m3u_final_path)
+                txt_bytes = None
 
             # 原子写入TXT文件
-            txt_filename = f'{prefix}{base_filename}.txt'
-            txt_final_path = os.path.join(output_dir, txt_filename)
             txt_temp_path = f'{txt_final_path}.tmp'
 
-            with open(txt_temp_path, 'w', encoding='utf-8') as f:
-                f.write(txt_content)
+            # 整体编码一次后以二进制一次写出，绕过 TextIOWrapper 的分块编码；写完后的偏移即文件大小，无需再 stat
+            with open(txt_temp_path, 'wb') as f:
+                _fchmod_output(f.fileno())
+                if txt_bytes is not None:
+                    f.write(txt_bytes)
+                else:
+                    # 生成一个简单的备份TXT文件
+                    self._write_backup_txt(sources, level, f)
+                txt_size = f.tell()
             os.replace(txt_temp_path, txt_final_path)
 
             # 记录文件信息
             m3u_size = os.path.getsize(m3u_final_path)
-            txt_size = os.path.getsize(txt_final_path)
 
-            self.logger_info(f'✓ 成功生成 {level} 播放列表文件:')
-            self.logger_info(f'  {m3u_filename} ({m3u_size} 字节, {len(sources)} 个频道)')
-            self.logger_info(f'  {txt_filename} ({txt_size} 字节)')
-
-            # 设置文件权限（确保Nginx可读）
-            os.chmod(m3u_final_path, 0o644)
-            os.chmod(txt_final_path, 0o644)
+            self.logger_info('✓ 成功生成 %s 播放列表文件:', level)
+            self.logger_info('  %s (%d 字节, %d 个频道)', os.path.basename(m3u_final_path), m3u_size, len(sources))
+            self.logger_info('  %s (%d 字节)', os.path.basename(txt_final_path), txt_size)
 
             return True
 
@@ -889,36 +1017,29 @@ class EnhancedLiveSourceManager:
             self.logger_error(f'生成{level}播放列表文件时发生错误: {e}')
             return False
 
-    def _create_backup_m3u_content(self, sources: list[dict], level: str) -> str:
-        """创建备份M3U文件内容
+    def _write_backup_m3u(self, sources: list[dict], level: str, f: BinaryIO):
+        """将备份M3U内容逐条写入二进制文件对象（不在内存中拼出整份内容）
 
         Args:
             sources: 源数据列表
             level: 层级描述
-
-        Returns:
-            str: 备份M3U内容
+            f: 以 'wb' 打开的文件对象
         """
-        lines = ['#EXTM3U']
-        for source in sources:
-            lines.append(f'#EXTINF:-1,{source.get("name", "Unknown")}')
-            lines.append(source.get('url', ''))
-        return '\n'.join(lines)
+        f.write(b'#EXTM3U\n')
+        f.writelines(
+            f'#EXTINF:-1,{source.get("name", "Unknown")}\n{source.get("url", "")}\n'.encode() for source in sources
+        )
 
-    def _create_backup_txt_content(self, sources: list[dict], level: str) -> str:
-        """创建备份TXT文件内容
+    def _write_backup_txt(self, sources: list[dict], level: str, f: BinaryIO):
+        """将备份TXT内容逐条写入二进制文件对象（不在内存中拼出整份内容）
 
         Args:
             sources: 源数据列表
             level: 层级描述
-
-        Returns:
-            str: 备份TXT内容
+            f: 以 'wb' 打开的文件对象
         """
-        lines = [f'# {level}播放列表 - 备份版本']
-        for source in sources:
-            lines.append(f'{source.get("name", "Unknown")},{source.get("url", "")}')
-        return '\n'.join(lines)
+        f.write(f'# {level}播放列表 - 备份版本\n'.encode())
+        f.writelines(f'{source.get("name", "Unknown")},{source.get("url", "")}\n'.encode() for source in sources)
 
     def enhanced_output_statistics(
         self,
@@ -944,33 +1065,34 @@ class EnhancedLiveSourceManager:
         self.logger_info(f'基础筛选源: {len(base_sources)} ({len(base_sources) / total_valid * 100:.1f}%)')
         self.logger_info(f'高级筛选源: {len(qualified_sources)} ({len(qualified_sources) / total_valid * 100:.1f}%)')
 
+        # 一次遍历取出统计所需的三列（媒体类型/分辨率/分类），各项计数直接在列上进行，不再多次遍历源字典
+        columns = [
+            (get('media_type', 'unknown'), get('resolution', 'unknown'), get('category', 'unknown'))
+            for get in (source.get for source in valid_sources)
+        ]
+        media_column, resolution_column, category_column = zip(*columns, strict=True) if columns else ((), (), ())
+
         # 媒体类型统计
         self.logger_info('-' * 40)
         self.logger_info('媒体类型统计:')
-        media_types = {}
-        for source in valid_sources:
-            media_type = source.get('media_type', 'unknown')
-            media_types[media_type] = media_types.get(media_type, 0) + 1
+        media_types = Counter(media_column)
 
-        for media_type, count in sorted(media_types.items(), key=lambda x: x[1], reverse=True):
+        for media_type, count in media_types.most_common():
             percentage = count / len(valid_sources) * 100
             self.logger_info(f'  {media_type}: {count} 个 ({percentage:.1f}%)')
 
         # 分辨率统计（仅视频）
         self.logger_info('-' * 40)
         self.logger_info('视频分辨率统计:')
-        resolutions = {}
-        video_sources = [s for s in valid_sources if s.get('media_type') == 'video']
-
-        for source in video_sources:
-            res = source.get('resolution', 'unknown')
-            resolutions[res] = resolutions.get(res, 0) + 1
+        video_count = media_types['video']
+        resolutions = Counter(
+            res for media, res in zip(media_column, resolution_column, strict=True) if media == 'video'
+        )
 
         # 按数量排序，显示前10个
-        sorted_resolutions = sorted(resolutions.items(), key=lambda x: x[1], reverse=True)
-        for res, count in sorted_resolutions[:10]:
-            if video_sources:
-                percentage = count / len(video_sources) * 100
+        for res, count in resolutions.most_common(10):
+            if video_count:
+                percentage = count / video_count * 100
                 self.logger_info(f'  {res}: {count} 个 ({percentage:.1f}%)')
             else:
                 self.logger_info(f'  {res}: {count} 个')
@@ -978,14 +1100,10 @@ class EnhancedLiveSourceManager:
         # 分类统计
         self.logger_info('-' * 40)
         self.logger_info('频道分类统计:')
-        categories = {}
-        for source in valid_sources:
-            category = source.get('category', 'unknown')
-            categories[category] = categories.get(category, 0) + 1
+        categories = Counter(category_column)
 
         # 按数量排序
-        sorted_categories = sorted(categories.items(), key=lambda x: x[1], reverse=True)
-        for category, count in sorted_categories:
+        for category, count in categories.most_common():
             percentage = count / len(valid_sources) * 100
             self.logger_info(f'  {category}: {count} 个 ({percentage:.1f}%)')
 
@@ -1006,10 +1124,8 @@ class EnhancedLiveSourceManager:
         # 运行增强处理流程
         self.logger_info('第二步：开始增强版处理流程...')
         try:
-            # 创建新的事件循环（确保在容器环境中正常工作）
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            process_success = loop.run_until_complete(self.enhanced_process_sources())
+            # 单一事件循环：asyncio.run 负责创建/关闭循环，处理流程与连接池释放在同一循环内完成
+            process_success = asyncio.run(self._run_enhanced_process())
 
             if process_success:
                 total_time = time.time() - self.start_time
@@ -1027,23 +1143,18 @@ class EnhancedLiveSourceManager:
             self.logger_error(f'✗ 增强版主程序运行失败: {e}')
             self.logger_error(traceback.format_exc())
             return False
+
+    async def _run_enhanced_process(self) -> bool:
+        """在同一事件循环内执行增强处理流程，并在结束时释放 SourceManager 的 aiohttp 连接池
+
+        F-4 修复：单一事件循环管理——连接池在创建它的循环内关闭，不再为关闭另起循环。
+        """
+        try:
+            return await self.enhanced_process_sources()
         finally:
-            # F-4 修复：单一事件循环管理
-            # BUG-6 修复：loop 初始化为 None，防止 try 块中 loop 未创建时异常路径的错误引用
-            loop = None
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_closed():
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                # 释放SourceManager的aiohttp连接池
-                if hasattr(self, 'source_manager') and self.source_manager is not None:
-                    with contextlib.suppress(Exception):
-                        loop.run_until_complete(self.source_manager.close())
-            finally:
-                if loop is not None and not loop.is_closed():
-                    loop.close()
-                asyncio.set_event_loop(None)
+            if self.source_manager is not None:
+                with contextlib.suppress(Exception):
+                    await self.source_manager.close()
 
     async def run_periodic(self, interval_seconds: int = 3600):
         """定时执行模式，替代外部 cron 调度
@@ -1077,96 +1188,93 @@ class EnhancedLiveSourceManager:
             await asyncio.sleep(interval_seconds)
 
     def ensure_output_directory(self) -> bool:
-        """确保输出目录存在
+        """确保输出目录存在，并创建默认文件（防止空目录）
+
+        目录探测与默认文件创建在同一次调用中完成，共享输出参数与路径。
 
         Returns:
-            bool: 目录准备是否成功
+            bool: 目录准备是否成功（默认文件创建失败只记录警告）
         """
         try:
-            output_dir = self.config.get_output_params()['output_dir']
-            self.logger_info(f'检查输出目录: {output_dir}')
+            output_params = self.config.get_output_params()
+            output_dir = output_params['output_dir']
+            self.logger_info('检查输出目录: %s', output_dir)
 
-            os.makedirs(output_dir, exist_ok=True)
+            _stat_output_dir(output_dir)
 
             if not os.access(output_dir, os.W_OK):
                 self.logger_error(f'输出目录不可写: {output_dir}')
                 return False
 
-            self._create_default_files(output_dir)
-            self.logger_info(f'✓ 输出目录准备完成: {output_dir}')
+            # 创建默认文件：O_CREAT|O_EXCL 把存在性检查与创建合为一次系统调用（无 exists→open 竞态），已存在的文件不再触碰
+            try:
+                default_paths = _output_file_paths(output_dir, output_params['filename'])
+                for default_path, (content, label) in zip(default_paths, _DEFAULT_FILES, strict=True):
+                    try:
+                        fd = os.open(default_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, _OUTPUT_FILE_MODE)
+                    except FileExistsError:
+                        continue
+                    try:
+                        _fchmod_output(fd)
+                        os.write(fd, content)
+                    finally:
+                        os.close(fd)
+                    self.logger_info('创建默认%s文件: %s', label, default_path)
+            except Exception as e:
+                self.logger_warning(f'创建默认文件失败: {e}')
+
+            self.logger_info('✓ 输出目录准备完成: %s', output_dir)
             return True
 
         except Exception as e:
             self.logger_error(f'准备输出目录失败: {e}')
             return False
 
-    def _create_default_files(self, output_dir: str):
-        """创建默认文件（防止空目录）
-
-        Args:
-            output_dir: 输出目录路径
-        """
-        try:
-            base_filename = self.config.get_output_params()['filename'].replace('.m3u', '')
-            default_m3u_path = os.path.join(output_dir, f'{base_filename}.m3u')
-
-            if not os.path.exists(default_m3u_path):
-                default_content = """#EXTM3U
-#EXTINF:-1 tvg-id="default" tvg-name="默认频道" group-title="系统消息",默认频道
-# 直播源管理工具正在处理中，请稍后刷新...
-https://example.com/default"""
-
-                with open(default_m3u_path, 'w', encoding='utf-8') as f:
-                    f.write(default_content)
-                self.logger_info(f'创建默认M3U文件: {default_m3u_path}')
-
-            default_txt_path = os.path.join(output_dir, f'{base_filename}.txt')
-            if not os.path.exists(default_txt_path):
-                default_txt_content = """# 直播源管理工具
-# 正在处理直播源，请稍后刷新...
-默认频道,https://example.com/default"""
-
-                with open(default_txt_path, 'w', encoding='utf-8') as f:
-                    f.write(default_txt_content)
-                self.logger_info(f'创建默认TXT文件: {default_txt_path}')
-
-            # 设置文件权限
-            os.chmod(default_m3u_path, 0o644)
-            os.chmod(default_txt_path, 0o644)
-
-        except Exception as e:
-            self.logger_warning(f'创建默认文件失败: {e}')
-
     # ── 日志辅助方法 ──────────────────────────────
-    def _log(self, level: str, message: str):
-        """统一日志输出：优先使用 logger 实例，回退到 print。"""
-        if self.logger:
-            getattr(self.logger, level)(message)
-        elif level != 'debug':
-            print(f'{level.upper()}: {message}')
-
-    def logger_info(self, message: str):
-        self._log('info', message)
+    @property
+    def logger(self):
+        return self._logger
 
-    def logger_error(self, message: str):
-        self._log('error', message)
+    @logger.setter
+    def logger(self, logger):
+        """设置 logger 时一并绑定 logger_info/error/warning/debug
 
-    def logger_warning(self, message: str):
-        self._log('warning', message)
+        有 logger 时直接绑定其方法，无 logger 时回退到 print（debug 丢弃）；每次日志调用不再判断 logger 是否存在。
+        """
+        self._logger = logger
+        if logger:
+            self.logger_info = logger.info
+            self.logger_error = logger.error
+            self.logger_warning = logger.warning
+            self.logger_debug = logger.debug
+        else:
+            self.logger_info = functools.partial(_print_log, 'INFO')
+            self.logger_error = functools.partial(_print_log, 'ERROR')
+            self.logger_warning = functools.partial(_print_log, 'WARNING')
+            self.logger_debug = _discard_log
 
-    def logger_debug(self, message: str):
-        self._log('debug', message)
+    def _debug_enabled(self) -> bool:
+        """调试日志是否会真正输出（无 logger 时 _log 丢弃 debug）；热路径据此跳过 f-string 格式化。"""
+        return self.logger is not None and self.logger.isEnabledFor(logging.DEBUG)
 
 
-def main():
-    """主函数入口点 - 使用增强版管理器"""
-    import locale
+@functools.cache
+def _configure_locale():
+    """设置 UTF-8 区域（C.UTF-8 不可用时回退 en_US.UTF-8）
 
+    进程内只探测一次：main() 被重复调用（测试、嵌入调用）时不再逐个尝试 setlocale；
+    不在导入时执行，避免 web 等仅导入 app 包的调用方被改写全局 locale。
+    """
     try:
         locale.setlocale(locale.LC_ALL, 'C.UTF-8')
     except locale.Error:
         with contextlib.suppress(locale.Error):
             locale.setlocale(locale.LC_ALL, 'en_US.UTF-8')
+
+
+def main():
+    """主函数入口点 - 使用增强版管理器"""
+    _configure_locale()
     print('直播源管理工具（增强分层筛选修复版）启动中...')
 
     # 创建增强版管理器实例
@@ -1201,5 +1309,5 @@ def main():
 
 
 if __name__ == '__main__':
-    # 运行主程序（locale 已在 main() 首行设置）
+    # 运行主程序（locale 由 main() 首行的 _configure_locale 设置）
     sys.exit(main())
@@ -13,20 +13,38 @@
 4. YAML 回退机制保留，新增 load_from_yaml() 方法
 """
 
+import functools
 import json as _json
 import logging
 import os
 import re
+import sys
 import threading
 import time
 from collections import OrderedDict
 from typing import ClassVar
 
+from app.exceptions import FileException
+from app.utils import atomic_write
+
 try:
     import yaml
 except ImportError:
     yaml = None
 
+try:
+    import orjson  # 可选：更快的 JSON 编解码（规则解析缓存 / JSON 规则文件）
+except ImportError:
+    orjson = None
+
+try:
+    import ahocorasick  # pyahocorasick：可选，多模式关键词单次扫描
+except ImportError:
+    ahocorasick = None
+
+# 优先使用 libyaml C 扩展加载器（与 SafeLoader 语义一致，解析速度快数倍）
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', None) or getattr(yaml, 'SafeLoader', None)
+
 
 # ── 分类规则数据库访问（从 web.models 迁移，供 app 层使用） ──
 
@@ -94,6 +112,57 @@ _DEFAULT_NEGATIVE_KEYWORDS = [
     'demo channel',
 ]
 
+# 媒体类型回退关键词（与大写频道名比较，单次 C 层扫描代替逐词 any()）
+_RADIO_NAME_RE = re.compile('FM|AM|广播|RADIO')
+_TV_NAME_RE = re.compile('TV|TELEVISION|电视')
+
+# 语言识别回退关键词（按优先级排列，与大写频道名比较）
+_LANG_KEYWORDS = (
+    (
+        'en',
+        (
+            '英文',
+            '英语',
+            'ENGLISH',
+            'BBC',
+            'CNN',
+            'FOX',
+            'HBO',
+            'DISCOVERY',
+            'NATIONAL GEOGRAPHIC',
+            'AL JAZEERA',
+        ),
+    ),
+    ('ja', ('日语', '日文', 'JAPANESE', 'NHK')),
+    ('ko', ('韩语', '韩文', 'KOREAN', 'KBS', 'MBC', 'SBS')),
+    ('ru', ('俄语', '俄文', 'RUSSIAN', 'RT')),
+    ('fr', ('法语', '法文', 'FRENCH', 'FRANCE')),
+    ('de', ('德语', '德文', 'GERMAN')),
+)
+_LANG_CODES = tuple(lang for lang, _ in _LANG_KEYWORDS)
+# 每个语言一个分组，包在零宽前瞻里逐位置尝试：同一位置按优先级取第一个命中的分组，
+# 所有位置中最小的分组号即"有关键词出现的最高优先级语言"，与逐语言 any() 扫描等价
+_LANG_RE = re.compile('(?=' + '|'.join('(' + '|'.join(map(re.escape, kws)) + ')' for _, kws in _LANG_KEYWORDS) + ')')
+
+# YAML 解析结果的磁盘缓存后缀（与规则文件同目录，按 mtime+size 校验新鲜度）
+_YAML_CACHE_SUFFIX = '.cache.json'
+
+
+def _json_loads(data: bytes):
+    """JSON 解码：优先 orjson，缺失时回退标准库"""
+    return orjson.loads(data) if orjson is not None else _json.loads(data)
+
+
+def _json_dumps(obj) -> str:
+    """JSON 编码（保留中文原文）：优先 orjson，缺失时回退标准库"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return _json.dumps(obj, ensure_ascii=False)
+
+
+# 地理匹配前的名称清洗：去掉非单词/非中文字符（模块级预编译，避免每个频道查一次 re 缓存）
+_CLEAN_RE = re.compile(r'[^\w\u4e00-\u9fff]')
+
 
 class ChannelRules:
     """频道规则管理类 — 数据库驱动版（多维分类）
@@ -164,6 +233,13 @@ class ChannelRules:
         '标清': '标清',
         '普清': '普清',
     }
+    # 清晰度回退检测用：按关键词长度降序预排序、预转小写（类定义时算一次）
+    _QUALITY_PATTERNS: ClassVar[tuple[tuple[str, str], ...]] = tuple(
+        (pattern.lower(), quality) for pattern, quality in sorted(QUALITY_KEYWORDS.items(), key=lambda x: -len(x[0]))
+    )
+
+    # 分类/频道信息结果缓存上限（播放列表中同名频道大量重复，命中后 O(1) 返回）
+    CACHE_MAX_SIZE: ClassVar[int] = 16384
 
     def __init__(self, rules_path: str = '/config/channel_rules.yml'):
         """初始化频道规则管理器
@@ -173,7 +249,7 @@ class ChannelRules:
         """
         self.rules_path = rules_path
         self.logger = logging.getLogger('ChannelRules')
-        self.rules = {}  # 原始 YAML 结构（用于回退）
+        self._rules: dict = {}  # 原始 YAML 结构（用于回退），经 rules 属性访问
         self.rule_list: list[dict] = []  # 扁平化的规则列表（content 维度）
         self.rules_by_dim: dict[str, list[dict]] = {}  # {dim: [{name, keywords, priority, sort_order}]}
         self.category_rules_raw: list[dict] = []  # DB 原始分类规则
@@ -182,25 +258,67 @@ class ChannelRules:
         self.negative_keywords: list[str] = list(_DEFAULT_NEGATIVE_KEYWORDS)  # 负向排除关键词
 
         # 缓存（使用 OrderedDict 确保 LRU popitem(last=False) 正确工作）
-        self._category_cache: dict[str, str] = OrderedDict()  # 单分类缓存
-        self._multi_category_cache: dict[str, dict[str, str]] = OrderedDict()  # 多维分类缓存
+        self._category_cache: OrderedDict[str, str] = OrderedDict()  # 单分类缓存
+        self._multi_category_cache: OrderedDict[str, dict[str, str]] = OrderedDict()  # 多维分类缓存
+        self._info_cache: OrderedDict[str, dict] = OrderedDict()  # extract_channel_info 结果缓存（不含 source_id）
         # 缓存读写锁：防止多线程并发读写 OrderedDict 导致的竞态/损坏
         # （规则引擎在 web 请求线程与后台解析线程间共享，单一锁覆盖两个缓存）
         self._cache_lock: threading.RLock = threading.RLock()
         self._last_load: float = 0.0
 
-        # 加载规则
-        self._load_from_db()
+        self._category_rules_sorted: tuple[dict, ...] = ()  # 按 priority 预排序的分类规则（get_category_rules）
+
+        # 维度规则扁平索引（加载时由 _build_dim_index 构建，按 DIMENSIONS 顺序，匹配热路径只读）：
+        # ((dim, ((name, priority, sort_order, pattern, ((kw, KW_UPPER), ...)), ...), automaton), ...)
+        self._dim_index: tuple[tuple[str, tuple, object], ...] = ()
+        # 全部维度关键词（大写）的最短长度；频道名比它还短时不可能命中任何规则（无关键词时为 sys.maxsize）
+        self._min_keyword_len: int = sys.maxsize
+
+        # 地理规则索引（加载时由 _build_geo_index 构建，_extract_geography 只读）
+        self._geo_countries: list[tuple] = []  # [(continent_name, country_code, is_cn, provinces, regions)]
+        self._geo_keywords: dict[str, tuple] = {}  # {KEYWORD_UPPER: (payloads, 单独命中时的 info 更新)}
+        self._geo_kw_lengths: tuple[int, ...] = ()  # 关键词长度集合（降序），无 pyahocorasick 时的回退扫描用
+        self._geo_automaton = None
+
+        # 规则延迟到首次使用时加载（_ensure_loaded），只构造不分类的调用方不付出 DB/YAML 加载开销
+        self._loaded = False
+        self._loading = False
+        self._load_lock = threading.RLock()
+
+    # ── 延迟加载 ─────────────────────────────────
+
+    @property
+    def rules(self) -> dict:
+        """原始规则结构（首次访问时触发加载）"""
+        self._ensure_loaded()
+        return self._rules
+
+    @rules.setter
+    def rules(self, value: dict):
+        self._rules = value
+
+    def _ensure_loaded(self):
+        """首次使用时从数据库加载规则（线程安全；加载过程中的内部访问直接放行）"""
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded or self._loading:
+                return
+            self._loading = True
+            try:
+                self._load_from_db()
+            finally:
+                self._loading = False
 
     # ── 数据库加载 ─────────────────────────────────
 
     def _prune_cache(self):
-        """限制缓存大小（LRU-style: 保留最近写入的 MAX_CACHE 条）
+        """限制缓存大小（LRU: 保留最近使用的 CACHE_MAX_SIZE 条）
 
         使用 OrderedDict 保证 O(1) 头部弹出：
-        self._multi_category_cache 和 self._category_cache 都必须是 OrderedDict 实例。
+        self._multi_category_cache、self._category_cache 和 self._info_cache 都必须是 OrderedDict 实例。
         """
-        MAX_CACHE = 200
+        MAX_CACHE = self.CACHE_MAX_SIZE
         with self._cache_lock:
             # 保证是 OrderedDict
             if not isinstance(self._multi_category_cache, OrderedDict):
@@ -214,6 +332,8 @@ class ChannelRules:
             if len(self._category_cache) > MAX_CACHE:
                 while len(self._category_cache) > MAX_CACHE:
                     self._category_cache.popitem(last=False)
+            while len(self._info_cache) > MAX_CACHE:
+                self._info_cache.popitem(last=False)
 
     def _load_from_db(self):
         """从数据库加载规则（主加载路径）"""
@@ -316,6 +436,7 @@ class ChannelRules:
             'channel_types': {},  # DB 不提供 channel_types 时为空
             'geography': {},  # DB 不提供 geography 时为空
         }
+        self._build_indexes()
 
     def _fallback_to_yaml(self):
         """YAML 回退加载"""
@@ -326,6 +447,8 @@ class ChannelRules:
     def load_from_yaml(self, path: str | None = None) -> dict:
         """手动从 YAML 文件加载规则（调试/回退用）
 
+        路径以 .json 结尾时按 JSON 规则文件加载（由 YAML 离线导出的运行期格式），不依赖 PyYAML。
+
         Args:
             path: YAML 文件路径，默认使用 self.rules_path
 
@@ -334,38 +457,54 @@ class ChannelRules:
         """
         path = path or self.rules_path
         self.logger.info(f'ℹ 从 YAML 加载规则: {path}')
+        is_json = path.endswith('.json')
 
-        if yaml is None:
+        if yaml is None and not is_json:
             self.logger.error('✗ PyYAML 未安装，无法从 YAML 加载')
             self.rules = {}
+            self._build_indexes()
             return self.rules
 
-        if not os.path.exists(path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
             self.logger.error(f'✗ YAML 文件不存在: {path}')
             self.rules = self.get_empty_rules()
             self._rebuild_from_rules()
             return self.rules
 
         try:
-            encodings = ['utf-8', 'gbk', 'gb2312', 'utf-8-sig']
-            content = None
-
-            for encoding in encodings:
-                try:
-                    with open(path, encoding=encoding) as f:
-                        content = f.read()
-                    break
-                except UnicodeDecodeError:
-                    continue
+            stamp = [st.st_mtime_ns, st.st_size]
+            rules = None if is_json else self._read_yaml_cache(path, stamp)
+            if rules is not None:
+                self.rules = rules
+                self._rebuild_from_rules()
+                self.logger.info(f'✓ YAML 规则从缓存加载，共 {len(self.rule_list)} 条分类规则')
+                return rules
+
+            # 只读一次字节，在内存中依次尝试各编码解码（避免每种编码重新打开/读取文件）
+            with open(path, 'rb') as f:
+                content_bytes = f.read()
+
+            if is_json:
+                rules = _json_loads(content_bytes) or self.get_empty_rules()
+            else:
+                content = None
+                for encoding in ('utf-8', 'gbk', 'gb2312', 'utf-8-sig'):
+                    try:
+                        content = content_bytes.decode(encoding)
+                        break
+                    except UnicodeDecodeError:
+                        continue
 
-            if content is None:
-                with open(path, 'rb') as f:
-                    content_bytes = f.read()
-                content = content_bytes.decode('utf-8', errors='ignore')
+                if content is None:
+                    content = content_bytes.decode('utf-8', errors='ignore')
 
-            rules = yaml.safe_load(content)
-            if not rules:
-                rules = self.get_empty_rules()
+                rules = yaml.load(content, Loader=_YAML_LOADER)
+                if not rules:
+                    rules = self.get_empty_rules()
+                else:
+                    self._write_yaml_cache(path, stamp, rules)
 
             self.rules = rules
             self._rebuild_from_rules()
@@ -378,6 +517,31 @@ class ChannelRules:
             self._rebuild_from_rules()
             return self.rules
 
+    def _read_yaml_cache(self, path: str, stamp: list[int]) -> dict | None:
+        """读取 YAML 解析缓存；缓存缺失、损坏或与源文件 (mtime_ns, size) 不一致时返回 None"""
+        try:
+            with open(path + _YAML_CACHE_SUFFIX, 'rb') as f:
+                cached = _json_loads(f.read())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cached, dict) or cached.get('source') != stamp:
+            return None
+        rules = cached.get('rules')
+        return rules if isinstance(rules, dict) and rules else None
+
+    def _write_yaml_cache(self, path: str, stamp: list[int], rules: dict):
+        """将 YAML 解析结果写入同目录 JSON 缓存，下次启动跳过 YAML 解析（失败仅记录调试日志）"""
+        try:
+            content = _json_dumps({'source': stamp, 'rules': rules})
+            atomic_write(path + _YAML_CACHE_SUFFIX, content, backup=False, verify=False, logger=self.logger)
+        except (TypeError, ValueError, FileException) as e:
+            self.logger.debug(f'YAML 解析缓存写入跳过: {e}')
+
+    @staticmethod
+    def _is_valid_category(category) -> bool:
+        """YAML 分类条目的最小结构要求：dict 且 name 为字符串（priority/keywords 有默认值）"""
+        return isinstance(category, dict) and isinstance(category.get('name'), str)
+
     def _rebuild_from_rules(self):
         """从 self.rules (YAML dict) 重建内部数据结构（支持多维）
 
@@ -387,7 +551,15 @@ class ChannelRules:
         self.rules_by_dim = {}
 
         # categories → content 维度
-        categories = self.rules.get('categories', [])
+        categories = self._rules.get('categories') or []
+        # 结构校验快速路径：全部合法时只做一次 all() 扫描；否则定位并跳过非法条目，不让单条坏规则拖垮整个加载
+        if not all(map(self._is_valid_category, categories)):
+            valid = [c for c in categories if self._is_valid_category(c)]
+            first_bad = next(c for c in categories if not self._is_valid_category(c))
+            self.logger.warning(
+                f'⚠ YAML 分类规则结构异常，已跳过 {len(categories) - len(valid)} 条，首条: {first_bad!r}'
+            )
+            categories = valid
         dim_rules = []
         for rule in categories:
             rule_name = rule.get('name', '').strip()
@@ -404,7 +576,7 @@ class ChannelRules:
             )
 
         # channel_types → media_type 维度
-        channel_types = self.rules.get('channel_types', {})
+        channel_types = self._rules.get('channel_types', {})
         for ct_name, ct_keywords in channel_types.items():
             if isinstance(ct_keywords, list):
                 dim_rules.append(
@@ -448,11 +620,119 @@ class ChannelRules:
                         neg_set.add(str(kw_list))
         self.negative_keywords = list(neg_set)
 
+        self._build_indexes()
+
+    def _build_indexes(self):
+        """规则变更后重建全部匹配索引，并使旧规则下的结果缓存失效（每条加载路径的最后一步）"""
+        with self._cache_lock:
+            self._category_cache.clear()
+            self._multi_category_cache.clear()
+            self._info_cache.clear()
+        categories = self._rules.get('categories') or [] if isinstance(self._rules, dict) else []
+        self._category_rules_sorted = tuple(
+            sorted((c for c in categories if isinstance(c, dict)), key=lambda x: x.get('priority', 100))
+        )
+        self._build_dim_index()
+        self._build_geo_index()
+        self._loaded = True
+
+    def _build_dim_index(self):
+        """将 rules_by_dim 展平为不可变的维度规则索引（加载时执行一次）
+
+        每条规则预编译一个关键词并集正则：匹配时先用正则在 C 层判断该规则是否有任何关键词命中，
+        只有命中的规则才逐个关键词收集明细。关键词的大写形式在此一次算好，
+        热路径只读元组，不再逐次查 dict、也不再逐关键词 upper()。
+        关键词经 sys.intern 驻留，跨规则/维度/地理重复出现的关键词（如 CCTV、新闻）共享同一对象。
+
+        安装了 pyahocorasick 时，每个维度再把全部关键词合并为一个自动机，
+        值为 (规则序号, 关键词序号) 列表，单次扫描即可得到该维度全部命中。
+        """
+        index = []
+        min_len = sys.maxsize
+        for dim in self.DIMENSIONS:
+            entries = []
+            kw_positions: dict[str, list[tuple[int, int]]] = {}
+            for rule in self.rules_by_dim.get(dim, []):
+                keywords = tuple(
+                    (sys.intern(kw), sys.intern(kw.upper())) for kw in rule['keywords'] if isinstance(kw, str) and kw
+                )
+                if not keywords:
+                    continue
+                alternatives = sorted({kw_upper for _, kw_upper in keywords}, key=len, reverse=True)
+                pattern = re.compile('|'.join(map(re.escape, alternatives)))
+                for ki, (_, kw_upper) in enumerate(keywords):
+                    kw_positions.setdefault(kw_upper, []).append((len(entries), ki))
+                    min_len = min(min_len, len(kw_upper))
+                entries.append((rule['name'], rule['priority'], rule['sort_order'], pattern, keywords))
+
+            automaton = None
+            if ahocorasick is not None and kw_positions:
+                automaton = ahocorasick.Automaton()
+                for kw_upper, positions in kw_positions.items():
+                    automaton.add_word(kw_upper, tuple(positions))
+                automaton.make_automaton()
+            index.append((dim, tuple(entries), automaton))
+        self._dim_index = tuple(index)
+        self._min_keyword_len = min_len
+
+    def _build_geo_index(self):
+        """将 geography 嵌套规则展平为关键词索引（加载时执行一次）
+
+        每个关键词（大写）映射到若干 payload：
+        ('country', ci) / ('province', ci, pi) / ('region', ci, ri)，
+        ci/pi/ri 为国家/省份/地区在 YAML 中的遍历顺序，用于复现原嵌套循环的优先级。
+        同时预先算好"仅命中该关键词"时的 info 更新（绝大多数频道名只命中一个地理关键词）。
+        安装了 pyahocorasick 时构建 Aho-Corasick 自动机，单次扫描得到全部命中。
+        """
+        self._geo_countries = []
+        self._geo_keywords = {}
+        self._geo_kw_lengths = ()
+        self._geo_automaton = None
+
+        geography = self._rules.get('geography') if isinstance(self._rules, dict) else None
+        if not geography:
+            return
+
+        kw_map: dict[str, list[tuple]] = {}
+
+        def _add(keywords, payload):
+            for kw in keywords or []:
+                if isinstance(kw, str) and kw:
+                    kw_map.setdefault(sys.intern(kw.upper()), []).append(payload)
+
+        for continent in geography.get('continents', []):
+            continent_name = continent.get('name', 'Asia')
+            for country in continent.get('countries', []):
+                ci = len(self._geo_countries)
+                is_cn = country.get('code') == 'CN'
+                provinces = [p.get('name') for p in country.get('provinces', [])] if is_cn else []
+                regions = [(r.get('name'), r.get('code', 'CN')) for r in country.get('regions', [])]
+                self._geo_countries.append((continent_name, country.get('code', 'CN'), is_cn, provinces, regions))
+
+                _add(country.get('keywords'), ('country', ci))
+                if is_cn:
+                    for pi, province in enumerate(country.get('provinces', [])):
+                        _add(province.get('keywords'), ('province', ci, pi))
+                for ri, region in enumerate(country.get('regions', [])):
+                    _add(region.get('keywords'), ('region', ci, ri))
+
+        for kw, payloads in kw_map.items():
+            payloads_tuple = tuple(payloads)
+            self._geo_keywords[kw] = (payloads_tuple, self._resolve_geo_hits((payloads_tuple,)))
+        self._geo_kw_lengths = tuple(sorted({len(kw) for kw in self._geo_keywords}, reverse=True))
+        if ahocorasick is not None and self._geo_keywords:
+            automaton = ahocorasick.Automaton()
+            for kw, entry in self._geo_keywords.items():
+                automaton.add_word(kw, entry)
+            automaton.make_automaton()
+            self._geo_automaton = automaton
+
     def reload(self):
         """手动刷新规则数据"""
         with self._cache_lock:
             self.clear_category_cache()
             self._multi_category_cache.clear()
+            self._info_cache.clear()
         self._load_from_db()
         self.logger.info('✓ 规则已刷新')
 
@@ -489,8 +769,9 @@ class ChannelRules:
         }
 
     def get_category_rules(self) -> list[dict]:
-        """获取分类规则列表，按优先级排序（兼容旧接口）"""
-        return sorted(self.rules.get('categories', []), key=lambda x: x.get('priority', 100))
+        """获取分类规则列表，按优先级排序（兼容旧接口；排序在加载时完成）"""
+        self._ensure_loaded()
+        return list(self._category_rules_sorted)
 
     def get_channel_type_rules(self) -> dict[str, list[str]]:
         """获取频道类型规则（兼容旧接口）"""
@@ -502,25 +783,37 @@ class ChannelRules:
 
     # ── 核心匹配逻辑（多维）─────────────────────────
 
-    def _match_dimension(self, channel_upper: str, rules: list[dict]) -> list[dict]:
-        """对单个维度的规则列表进行匹配，返回按最佳优先排序的结果
+    def _match_dimension(self, channel_upper: str, rules: tuple, automaton=None) -> list[dict]:
+        """对单个维度的规则索引（_dim_index 条目）进行匹配，返回按最佳优先排序的结果
 
         Returns:
             [{'name', 'keyword', 'priority', 'keyword_len', 'sort_order'}, ...]
         """
+        if automaton is not None:
+            # 单次扫描收集命中的 (规则序号, 关键词序号)，排序后与逐规则扫描的追加顺序一致
+            hits = sorted({pos for _, positions in automaton.iter(channel_upper) for pos in positions})
+        else:
+            hits = [
+                (ri, ki)
+                for ri, (_, _, _, pattern, keywords) in enumerate(rules)
+                if pattern.search(channel_upper)
+                for ki, (_, kw_upper) in enumerate(keywords)
+                if kw_upper in channel_upper
+            ]
+
         matches = []
-        for rule in rules:
-            for kw in rule['keywords']:
-                if isinstance(kw, str) and kw and kw.upper() in channel_upper:
-                    matches.append(
-                        {
-                            'name': rule['name'],
-                            'keyword': kw,
-                            'priority': rule['priority'],
-                            'keyword_len': len(kw),
-                            'sort_order': rule['sort_order'],
-                        }
-                    )
+        for ri, ki in hits:
+            name, priority, sort_order, _, keywords = rules[ri]
+            kw = keywords[ki][0]
+            matches.append(
+                {
+                    'name': name,
+                    'keyword': kw,
+                    'priority': priority,
+                    'keyword_len': len(kw),
+                    'sort_order': sort_order,
+                }
+            )
 
         # 按 priority → 最长关键词(-keyword_len) → sort_order 排序
         matches.sort(key=lambda m: (m['priority'], -m['keyword_len'], m['sort_order']))
@@ -545,10 +838,14 @@ class ChannelRules:
         if not channel_name:
             return {dim: '未知' for dim in self.DIMENSIONS}
 
+        self._ensure_loaded()
+
         # 缓存查找
         with self._cache_lock:
-            if channel_name in self._multi_category_cache:
-                return self._multi_category_cache[channel_name]
+            cached = self._multi_category_cache.get(channel_name)
+            if cached is not None:
+                self._multi_category_cache.move_to_end(channel_name)
+                return cached
 
         # ── 优先查全名映射表（人工修正/导入的权威数据） ──
         try:
@@ -569,15 +866,21 @@ class ChannelRules:
             pass  # 映射表查不到或异常，回退规则引擎
 
         channel_upper = channel_name.upper()
-        result = {}
+        if len(channel_upper) < self._min_keyword_len:
+            # 快速路径：频道名短于最短关键词（或规则为空），任何维度都不可能命中
+            result = {dim: '未知' for dim in self.DIMENSIONS}
+            with self._cache_lock:
+                self._multi_category_cache[channel_name] = result
+            self._prune_cache()
+            return result
 
-        for dim in self.DIMENSIONS:
-            rules = self.rules_by_dim.get(dim, [])
+        result = {}
+        for dim, rules, automaton in self._dim_index:
             if not rules:
                 result[dim] = '未知'
                 continue
 
-            matches = self._match_dimension(channel_upper, rules)
+            matches = self._match_dimension(channel_upper, rules, automaton)
 
             if not matches:
                 result[dim] = '未知'
@@ -691,8 +994,14 @@ class ChannelRules:
             override_name = longer_kw_override[best['name']]
             override_candidate = candidates_by_name.get(override_name)
             if override_candidate:
+                # 热路径日志用 %-style 惰性格式化：DEBUG 未开启时不构造字符串
                 self.logger.debug(
-                    f"长短词覆盖: '{channel_name}' {best['name']}({best['keyword']}) → {override_name}({override_candidate['keyword']})"
+                    "长短词覆盖: '%s' %s(%s) → %s(%s)",
+                    channel_name,
+                    best['name'],
+                    best['keyword'],
+                    override_name,
+                    override_candidate['keyword'],
                 )
                 return override_name
 
@@ -767,7 +1076,8 @@ class ChannelRules:
     def extract_channel_info(self, channel_name: str, source_id: int | None = None) -> dict:
         """使用规则提取频道信息 — 多维分类版
 
-        提取的信息包括各维度分类 + 原有字段
+        提取的信息包括各维度分类 + 原有字段。结果按频道名缓存（规则重载时失效），
+        每次返回独立副本，调用方可自由修改。
 
         Args:
             channel_name: 原始频道名称
@@ -776,10 +1086,41 @@ class ChannelRules:
         Returns:
             Dict: 包含完整多维分类信息的字典
         """
+        self._ensure_loaded()
+        if not channel_name:
+            # 快速路径：空名称不查缓存、不跑规则，直接返回默认信息
+            cached = self._extract_channel_info_uncached(channel_name)
+        else:
+            with self._cache_lock:
+                cached = self._info_cache.get(channel_name)
+                if cached is not None:
+                    self._info_cache.move_to_end(channel_name)
+        if cached is None:
+            cached = self._extract_channel_info_uncached(channel_name)
+            with self._cache_lock:
+                self._info_cache[channel_name] = cached
+            self._prune_cache()
+
+        info = dict(cached)
+        info['source_id'] = source_id
+
+        # ── 如果提供了 source_id，将各维度分类结果写入数据库 ──
+        if source_id is not None:
+            try:
+                categories_to_save = {dim: info.get(dim, '未知') for dim in self.DIMENSIONS}
+                save_source_categories_for_app(source_id, categories_to_save)
+            except Exception:
+                # 落库失败不影响分类结果
+                pass
+
+        return info
+
+    def _extract_channel_info_uncached(self, channel_name: str) -> dict:
+        """extract_channel_info 的实际提取逻辑（不含缓存与落库）"""
         # 初始化默认信息
         info = {
             'name': channel_name.strip(),
-            'source_id': source_id,
+            'source_id': None,
             'category': '其他频道',  # 主分类（content 维度）
             'content': '其他频道',
             'region': '未知',
@@ -798,6 +1139,8 @@ class ChannelRules:
             return info
 
         clean_name = channel_name.strip()
+        # 大写形式只算一次，供媒体类型/语言/地理各回退检测复用
+        name_upper = clean_name.upper()
 
         # ── 各维度分类 ──
         categories = self.determine_categories(channel_name)
@@ -832,51 +1175,27 @@ class ChannelRules:
         # ── 推断媒体类型（频道名关键字回退检测） ──
         if info['media_type'] == 'Other' or info['media_type'] == '未知':
             cat = info['category']
-            ch_upper = clean_name.upper()
             if '收音机' in cat or cat in ('在线音频',):
                 info['media_type'] = 'Radio'
             elif cat in ('央视频道', '卫视频道') or cat.endswith('频道') or cat in ('港澳台',):
                 info['media_type'] = 'TV'
-            elif any(kw in ch_upper for kw in ['FM', 'AM', '广播', 'RADIO']):
+            elif _RADIO_NAME_RE.search(name_upper):
                 info['media_type'] = 'Radio'
-            elif any(kw in ch_upper for kw in ['TV', 'TELEVISION', '电视']):
+            elif _TV_NAME_RE.search(name_upper):
                 info['media_type'] = 'TV'
 
         # ── 提取清晰度（频道名关键字回退检测） ──
         if not info['quality']:
-            for pattern, quality in sorted(self.QUALITY_KEYWORDS.items(), key=lambda x: -len(x[0])):
-                if pattern.lower() in clean_name.lower():
+            name_lower = clean_name.lower()
+            for pattern, quality in self._QUALITY_PATTERNS:
+                if pattern in name_lower:
                     info['quality'] = quality
                     break
 
         # ── 语言识别回退 ──
         if info['language'] == '未知':
-            lang_patterns = {
-                'en': [
-                    '英文',
-                    '英语',
-                    'ENGLISH',
-                    'BBC',
-                    'CNN',
-                    'FOX',
-                    'HBO',
-                    'DISCOVERY',
-                    'NATIONAL GEOGRAPHIC',
-                    'AL JAZEERA',
-                ],
-                'ja': ['日语', '日文', 'JAPANESE', 'NHK'],
-                'ko': ['韩语', '韩文', 'KOREAN', 'KBS', 'MBC', 'SBS'],
-                'ru': ['俄语', '俄文', 'RUSSIAN', 'RT'],
-                'fr': ['法语', '法文', 'FRENCH', 'FRANCE'],
-                'de': ['德语', '德文', 'GERMAN'],
-            }
-            ch_upper = clean_name.upper()
-            for lang, keywords in lang_patterns.items():
-                if any(kw in ch_upper for kw in keywords):
-                    info['language'] = lang
-                    break
-            else:
-                info['language'] = 'zh'
+            hit = min((m.lastindex for m in _LANG_RE.finditer(name_upper)), default=None)
+            info['language'] = _LANG_CODES[hit - 1] if hit else 'zh'
 
         # ── 提取省份（优先匹配与 content 分类一致的省份） ──
         cat = info['category']
@@ -897,67 +1216,84 @@ class ChannelRules:
             info['province'] = matched
 
         # ── 使用YAML地理规则（如果可用）提取国家/地区 ──
-        self._extract_geography(channel_name, info)
-
-        # ── 如果提供了 source_id，将各维度分类结果写入数据库 ──
-        if source_id is not None:
-            try:
-                categories_to_save = {dim: info.get(dim, '未知') for dim in self.DIMENSIONS}
-                save_source_categories_for_app(source_id, categories_to_save)
-            except Exception:
-                # 落库失败不影响分类结果
-                pass
+        self._extract_geography(channel_name, info, name_upper)
 
-        self.logger.debug(f'频道信息提取完成: {info}')
+        self.logger.debug('频道信息提取完成: %s', info)
         return info
 
-    def _extract_geography(self, channel_name: str, info: dict):
+    def _extract_geography(self, channel_name: str, info: dict, name_upper: str | None = None):
         """使用地理规则提取国家/地区/省份信息（兼容旧接口）
 
-        从 YAML 规则中提取，如果 YAML 不可用则跳过。
+        从 YAML 规则中提取（基于 _build_geo_index 预建的索引），如果 YAML 不可用则跳过。
+        name_upper 为调用方已算好的大写频道名（可省略）。
         """
-        if not self.rules:
+        if not self._geo_countries:
             return
 
-        geography_rules = self.get_geography_rules()
-        if not geography_rules:
-            return
-
-        clean_name = re.sub(r'[^\w\u4e00-\u9fff]', '', channel_name.upper())
-        country_matched = False
-
-        for continent in geography_rules.get('continents', []):
-            for country in continent.get('countries', []):
-                for keyword in country.get('keywords', []):
-                    if keyword.upper() in clean_name:
-                        info['country'] = country.get('code', 'CN')
-                        info['continent'] = continent.get('name', 'Asia')
-                        country_matched = True
-                        break
-
-                if not country_matched and country.get('code') == 'CN':
-                    for province in country.get('provinces', []):
-                        for keyword in province.get('keywords', []):
-                            if keyword.upper() in clean_name:
-                                info['province'] = province.get('name')
-                                info['country'] = 'CN'
-                                info['continent'] = 'Asia'
-                                country_matched = True
-                                break
-                        if country_matched:
-                            break
-
-                if country_matched:
-                    for region in country.get('regions', []):
-                        for keyword in region.get('keywords', []):
-                            if keyword.upper() in clean_name:
-                                info['country'] = region.get('code', 'CN')
-                                info['region'] = region.get('name')
-                                break
-                    break
-
-            if country_matched:
-                break
+        clean_name = _CLEAN_RE.sub('', name_upper if name_upper is not None else channel_name.upper())
+        if self._geo_automaton is not None:
+            hits = [entry for _, entry in self._geo_automaton.iter(clean_name)]
+        else:
+            hits = list(self._scan_geo_keywords(clean_name))
+
+        if len(hits) == 1:
+            # 快速路径：只命中一个地理关键词（常见的单省/单市频道名），直接套用加载时预算的结果
+            info.update(hits[0][1])
+        elif hits:
+            info.update(self._resolve_geo_hits(payloads for payloads, _ in hits))
+
+    def _resolve_geo_hits(self, hits) -> dict:
+        """将命中的 payloads 归并为需写入 info 的字段（无有效命中时返回空 dict）"""
+        # 汇总命中：国家关键词 / 首个命中省份 / 最后命中地区（与原嵌套循环的覆盖顺序一致）
+        country_hits: set[int] = set()
+        province_hits: dict[int, int] = {}
+        region_hits: dict[int, int] = {}
+        for payloads in hits:
+            for payload in payloads:
+                level, ci = payload[0], payload[1]
+                if level == 'country':
+                    country_hits.add(ci)
+                elif level == 'province':
+                    if payload[2] < province_hits.get(ci, len(self._geo_countries[ci][3])):
+                        province_hits[ci] = payload[2]
+                elif payload[2] > region_hits.get(ci, -1):
+                    region_hits[ci] = payload[2]
+
+        candidates = country_hits.union(province_hits)
+        if not candidates:
+            return {}
+
+        updates = {}
+        ci = min(candidates)
+        continent_name, country_code, _is_cn, provinces, regions = self._geo_countries[ci]
+        if ci in country_hits:
+            updates['country'] = country_code
+            updates['continent'] = continent_name
+        else:
+            updates['province'] = provinces[province_hits[ci]]
+            updates['country'] = 'CN'
+            updates['continent'] = 'Asia'
+
+        if ci in region_hits:
+            region_name, region_code = regions[region_hits[ci]]
+            updates['country'] = region_code
+            updates['region'] = region_name
+        return updates
+
+    def _scan_geo_keywords(self, clean_name: str):
+        """无 pyahocorasick 时的回退扫描：按位置 × 关键词长度切片查哈希表
+
+        复杂度 O(|name| × 不同关键词长度数) 次 dict 查找，与关键词总数无关，
+        大规则库（数千个市县关键词）下远少于逐关键词子串判断。
+        """
+        keywords = self._geo_keywords
+        n = len(clean_name)
+        for i in range(n):
+            for length in self._geo_kw_lengths:
+                if i + length <= n:
+                    entry = keywords.get(clean_name[i : i + length])
+                    if entry is not None:
+                        yield entry
 
     # ── 测试工具 ────────────────────────────────────
 
@@ -1001,3 +1337,13 @@ class ChannelRules:
 
         self.logger.info(f'📊 测试结果: {correct}/{total} 正确 ({accuracy:.1f}%)')
         return results
+
+
+@functools.cache
+def get_channel_rules(rules_path: str = '/config/channel_rules.yml') -> ChannelRules:
+    """获取进程内共享的 ChannelRules 实例（按规则路径缓存）
+
+    首次调用完成 DB/YAML 加载与索引构建，之后同一路径直接返回同一实例。
+    需要感知规则变更的调用方应对返回实例调用 reload()，或直接构造新的 ChannelRules。
+    """
+    return ChannelRules(rules_path)
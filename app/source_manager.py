@@ -49,6 +49,7 @@ from app.config import Config
 from app.exceptions import SourceDownloadError, SourceParseError
 from app.rules import ChannelRules
 from app.security import is_static_safe
+from app.utils import decode_bytes
 
 
 class SourceManager:
@@ -109,14 +110,13 @@ class SourceManager:
     def _load_github_entry_map(self) -> None:
         """加载 GitHub 条目→文件名 映射（采集时落盘，重启后可恢复，供文件级 UA 精确匹配）"""
         try:
-            if os.path.exists(self._github_entry_map_path):
-                with open(self._github_entry_map_path, encoding='utf-8') as f:
-                    data = json.load(f)
-                if isinstance(data, dict):
-                    self._github_entry_map = {
-                        k: v for k, v in data.items() if isinstance(k, str) and isinstance(v, list)
-                    }
-                self.logger.debug(f'已加载 GitHub 条目映射: {len(self._github_entry_map)} 条')
+            with open(self._github_entry_map_path, encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._github_entry_map = {k: v for k, v in data.items() if isinstance(k, str) and isinstance(v, list)}
+            self.logger.debug(f'已加载 GitHub 条目映射: {len(self._github_entry_map)} 条')
+        except FileNotFoundError:
+            pass
         except Exception as e:
             self.logger.warning(f'加载 GitHub 条目映射失败(忽略): {e}')
             self._github_entry_map = {}
@@ -975,17 +975,16 @@ class SourceManager:
         """
         encodings = ['utf-8', 'gbk', 'gb2312', 'latin1', 'iso-8859-1']
 
-        for encoding in encodings:
-            try:
-                with open(file_path, encoding=encoding) as f:
-                    return f.read()
-            except UnicodeDecodeError:
-                continue
-
-        # 如果所有编码都失败,使用二进制读取并忽略错误
+        # 只读一次原始字节，各编码在内存中尝试解码（不再每种编码重新打开、读取整个文件）
         with open(file_path, 'rb') as f:
             content_bytes = f.read()
-        return content_bytes.decode('utf-8', errors='ignore')
+
+        content = decode_bytes(content_bytes, encodings)
+        if content is None:
+            # 如果所有编码都失败,忽略错误解码
+            content = content_bytes.decode('utf-8', errors='ignore')
+        # 与文本模式 open() 的通用换行一致
+        return content.replace('\r\n', '\n').replace('\r', '\n')
 
     def extract_name(self, extinf_line: str) -> str:
         """
@@ -6,6 +6,7 @@
 原子写入、安全读取、备份等文件操作工具。
 """
 
+import codecs
 import contextlib
 import logging
 import os
@@ -114,6 +115,27 @@ def _backup_file(filepath: str, backup_dir: str | None = None, logger: logging.L
         _log.warning('备份失败: %s -> %s (%s)', filepath, backup_path, e)
 
 
+# 编码探测只解码文件前缀（64 KiB）：前缀即出错的候选编码无需对全文解码
+_DECODE_SAMPLE_BYTES = 64 * 1024
+
+
+def decode_bytes(raw: bytes, encodings: list[str]) -> str | None:
+    """按顺序尝试候选编码解码，返回第一个成功的结果；全部失败返回 None
+
+    先用增量解码器（final=False，截断在多字节字符中间不算错）探测前缀，
+    前缀通过后才对全文解码；全文解码失败则继续下一个候选编码。
+    """
+    sample = raw[:_DECODE_SAMPLE_BYTES] if len(raw) > _DECODE_SAMPLE_BYTES else None
+    for enc in encodings:
+        try:
+            if sample is not None:
+                codecs.getincrementaldecoder(enc)().decode(sample, final=False)
+            return raw.decode(enc)
+        except UnicodeDecodeError:
+            continue
+    return None
+
+
 def safe_read_file(
     filepath: str,
     encoding: str = 'utf-8',
@@ -121,26 +143,16 @@ def safe_read_file(
     logger: logging.Logger | None = None,
 ) -> str:
     """安全读取文件内容（支持多编码回退）"""
-    if not os.path.exists(filepath):
+    # 只读一次原始字节，各候选编码在内存中逐个解码；直接 open 并捕获 FileNotFoundError，省去额外的 exists() stat
+    try:
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+    except FileNotFoundError as e:
         raise FileException(
             message=f'文件未找到: {filepath}',
             suggestion='请检查文件路径是否正确',
             details={'filepath': filepath, 'reason': 'file_not_found'},
-        )
-    encodings = [encoding] + (fallback_encodings or ['gbk', 'gb2312', 'latin1', 'utf-8-sig'])
-    for enc in encodings:
-        try:
-            with open(filepath, encoding=enc) as f:
-                content = f.read()
-            if content.startswith('\ufeff'):
-                content = content[1:]
-            return content
-        except (UnicodeDecodeError, OSError):
-            continue
-    try:
-        with open(filepath, 'rb') as f:
-            raw = f.read()
-        return raw.decode('utf-8', errors='replace')
+        ) from e
     except OSError as e:
         raise FileException(
             message=f'文件读取失败: {filepath}',
@@ -148,6 +160,16 @@ def safe_read_file(
             details={'filepath': filepath},
             original=e,
         ) from e
+    if raw.startswith(codecs.BOM_UTF8):
+        raw = raw[len(codecs.BOM_UTF8) :]
+    encodings = [encoding] + (fallback_encodings or ['gbk', 'gb2312', 'latin1', 'utf-8-sig'])
+    content = decode_bytes(raw, encodings)
+    if content is None:
+        content = raw.decode('utf-8', errors='replace')
+    elif content.startswith('\ufeff'):
+        content = content[1:]
+    # 与文本模式 open() 的通用换行一致
+    return content.replace('\r\n', '\n').replace('\r', '\n')
 
 
 def _get_fallback_logger() -> logging.Logger:
@@ -164,6 +164,17 @@ class TestConfigRead:
         val = config_instance.getboolean('Sources', 'nonexistent', True)
         assert val is True
 
+    def test_get_reads_from_config_snapshot(self, config_instance, monkeypatch):
+        """get() 走全量快照，不再逐键查询"""
+        import web.models as _m
+
+        def _fail(key):
+            raise AssertionError(f'unexpected single-key query: {key}')
+
+        monkeypatch.setattr(_m, 'get_app_config', _fail)
+        assert config_instance.get('Logging', 'level') == 'INFO'
+        assert config_instance.get('Logging', 'missing', 'x') == 'x'
+
     def test_items_returns_dict(self, config_instance):
         """items() 返回 section 的键值对"""
         section = config_instance.items('Logging')
@@ -253,3 +264,42 @@ class TestConfigUserAgents:
             assert len(uas) >= 1
         else:
             assert len(uas) >= 1
+
+
+# ── get_*_config() 结果缓存 ───────────────────
+
+
+class TestConfigMemoize:
+    """get_*_config() 按配置快照缓存，写入后失效"""
+
+    def test_same_object_until_write(self, config_instance):
+        first = config_instance.get_filter_params()
+        assert config_instance.get_filter_params() is first
+        config_instance.set('Filter', 'min_speed', '99')
+        second = config_instance.get_filter_params()
+        assert second is not first
+        assert second['min_speed'] == 99
+
+    def test_reload_clears_cache(self, config_instance):
+        first = config_instance.get_sources()
+        config_instance.reload()
+        assert config_instance.get_sources() is not first
+        assert config_instance.get_sources() == first
+
+    def test_typed_values_fall_back_to_defaults(self, temp_db):
+        _seed_app_config({'Network.proxy_port': 'bad', 'Network.ipv6_enabled': 'no'})
+        from app.config import Config
+
+        net = Config().get_network_config()
+        assert net['proxy_port'] == int(Config._DEFAULT_VALUES['Network.proxy_port'])
+        assert net['ipv6_enabled'] is False
+        assert net['download_batch_size'] == int(Config._DEFAULT_VALUES['Network.download_batch_size'])
+
+    def test_sources_split_drops_blank_entries(self, temp_db):
+        _seed_app_config({'Sources.local_dirs': ' ./a , ,./b', 'Sources.online_urls': 'http://x\r\n\n http://y '})
+        from app.config import Config
+
+        sources = Config().get_sources()
+        assert sources['local_dirs'] == ['./a', './b']
+        assert sources['online_urls'] == ['http://x', 'http://y']
+        assert sources['github_sources'] == []
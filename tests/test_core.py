@@ -142,3 +142,26 @@ class TestConnectionManager:
 
         cm = ConnectionManager()
         assert cm.count == 0
+
+
+class TestDefaultsYamlCache:
+    """_load_defaults_from_yaml：按 SHA-256 校验的 JSON 解析缓存"""
+
+    def test_cache_written_and_invalidated_by_content(self, tmp_path, monkeypatch):
+        import web.core as core
+
+        yaml_path = tmp_path / 'config-defaults.yaml'
+        yaml_path.write_text('Testing:\n  timeout: 7\n', encoding='utf-8')
+        monkeypatch.setattr(core, '_DEFAULTS_YAML_PATH', str(yaml_path))
+        monkeypatch.setattr(core, '_DEFAULTS_CACHE_PATH', str(yaml_path) + '.cache.json')
+
+        assert core._load_defaults_from_yaml() == {'Testing': {'timeout': 7}}
+        assert os.path.exists(core._DEFAULTS_CACHE_PATH)
+        monkeypatch.setattr(core.yaml, 'load', None)  # 命中缓存时不再解析 YAML
+        assert core._load_defaults_from_yaml() == {'Testing': {'timeout': 7}}
+        monkeypatch.undo()
+
+        monkeypatch.setattr(core, '_DEFAULTS_YAML_PATH', str(yaml_path))
+        monkeypatch.setattr(core, '_DEFAULTS_CACHE_PATH', str(yaml_path) + '.cache.json')
+        yaml_path.write_text('Testing:\n  timeout: 9\n', encoding='utf-8')
+        assert core._load_defaults_from_yaml() == {'Testing': {'timeout': 9}}
@@ -0,0 +1,79 @@
+"""
+app.logger 模块单元测试
+
+覆盖：Logger.setup_logging 的处理器装配（文件/控制台/兜底）、重复初始化
+以及 QueueHandler + 后台 QueueListener 的异步写入。
+"""
+
+import logging
+import logging.handlers
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from app.logger import Logger
+
+
+class TestSetupLogging:
+    """Logger.setup_logging 处理器装配"""
+
+    def test_file_and_console_handlers(self, tmp_path):
+        log_file = str(tmp_path / 'logs' / 'app.log')
+        log = Logger({'level': 'DEBUG', 'file': log_file})
+        assert log.logger.level == logging.DEBUG
+        assert len(log.listener.handlers) == 2
+        assert os.path.isdir(os.path.dirname(log_file))
+
+    def test_reinit_replaces_handlers(self, tmp_path):
+        config = {'file': str(tmp_path / 'app.log')}
+        first = Logger(config)
+        first_handlers = first.logger.handlers
+        second = Logger(config)
+        assert len(second.logger.handlers) == 1
+        assert second.logger.handlers[0] is not first_handlers[0]
+        assert first.listener._thread is None  # 旧的后台线程已停止
+
+    def test_fallback_console_when_no_handlers(self):
+        log = Logger({'file': '', 'enable_console': False})
+        assert len(log.listener.handlers) == 1
+        assert isinstance(log.listener.handlers[0], logging.StreamHandler)
+
+    def test_setup_diagnostics_logged_not_printed(self, capsys):
+        log = Logger({'file': '', 'enable_console': False})
+        log.close()
+        out = capsys.readouterr().out
+        assert '无日志处理器，创建基本控制台处理器' in out
+        assert 'WARNING' in out
+
+    def test_level_names_and_unknown_level(self):
+        assert Logger({'level': 'warn', 'file': ''}).logger.level == logging.WARNING
+        assert Logger({'level': 'bogus', 'file': ''}).logger.level == logging.INFO
+
+    def test_bare_filename_and_clear_on_startup(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / 'app.log').write_text('old', encoding='utf-8')
+        log = Logger({'file': 'app.log', 'clear_on_startup': True, 'enable_console': False})
+        assert isinstance(log.listener.handlers[0], logging.FileHandler)
+        log.close()
+        assert 'old' not in (tmp_path / 'app.log').read_text(encoding='utf-8')
+
+
+class TestQueueLogging:
+    """日志记录经队列交给后台线程写入"""
+
+    def test_records_written_by_listener(self, tmp_path):
+        log_file = tmp_path / 'app.log'
+        log = Logger({'file': str(log_file), 'enable_console': False})
+        handler = log.logger.handlers[0]
+        assert isinstance(handler, logging.handlers.QueueHandler)
+        log.logger.info('队列写入 %s', 42)
+        log.close()
+        assert '队列写入 42' in log_file.read_text(encoding='utf-8')
+        assert log.listener is None
+
+    def test_external_rotation_uses_watched_handler(self, tmp_path):
+        log = Logger({'file': str(tmp_path / 'app.log'), 'rotation': 'external', 'enable_console': False})
+        assert isinstance(log.listener.handlers[0], logging.handlers.WatchedFileHandler)
+        log.close()
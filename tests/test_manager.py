@@ -0,0 +1,266 @@
+"""EnhancedLiveSourceManager 集成测试：
+
+- 分层筛选（分类 + (频道, 分辨率) 分组取前 K + 条件筛选合并为一次遍历）与旧版两段式筛选结果一致
+- 输出目录准备、权限验证哨兵、备份播放列表与统计报告
+"""
+
+import os
+import random
+import stat
+from unittest.mock import MagicMock, patch
+
+import pytest
+from app.manager import _TOP_K_HEAP_THRESHOLD, EnhancedLiveSourceManager
+
+_FILTER_PARAMS = {
+    'max_latency': 3000,
+    'min_bitrate': 500,
+    'min_speed': 100,
+    'must_hd': False,
+    'must_4k': False,
+    'min_resolution': '1280x720',
+    'max_resolution': '3840x2160',
+    'resolution_filter_mode': 'range',
+}
+
+
+def _make_manager(filter_params: dict | None = None, output_params: dict | None = None) -> EnhancedLiveSourceManager:
+    manager = EnhancedLiveSourceManager()
+    manager.logger = MagicMock()
+    manager.config = MagicMock()
+    manager.config.get_filter_params.return_value = {**_FILTER_PARAMS, **(filter_params or {})}
+    manager.config.get_output_params.return_value = output_params or {}
+    return manager
+
+
+def _filter(manager: EnhancedLiveSourceManager, sources: list[dict]):
+    # 分类依赖规则库，这里原样返回源，只验证分组/排序/条件筛选
+    with patch.object(EnhancedLiveSourceManager, 'enhance_channel_classification', side_effect=lambda s: s):
+        return manager.hierarchical_filtering(sources)
+
+
+# ── 旧版两段式筛选（resolution_based_filtering + condition_based_filtering）的参照实现 ──
+
+
+def _reference_parse(res: str) -> tuple[int, int]:
+    try:
+        width, height = res.split('x')
+        return int(width), int(height)
+    except ValueError:
+        return 0, 0
+
+
+def _reference_qualified(source: dict, fp: dict) -> bool:
+    if source.get('status') != 'success':
+        return False
+    response_time = source.get('response_time', 9999)
+    if response_time > fp['max_latency']:
+        return False
+    if source.get('media_type', 'video') in ['radio', 'audio']:
+        return True
+    resolution = source.get('resolution', '')
+    if resolution and resolution != 'unknown':
+        res_w, res_h = _reference_parse(resolution)
+        min_w, min_h = _reference_parse(fp['min_resolution'])
+        max_w, max_h = _reference_parse(fp['max_resolution'])
+        if not (res_w >= min_w and res_h >= min_h and res_w <= max_w and res_h <= max_h):
+            return False
+    bitrate = source.get('bitrate', 0)
+    if bitrate > 0 and bitrate < fp['min_bitrate']:
+        return False
+    if fp['must_hd'] and not source.get('is_hd', False):
+        return False
+    if fp['must_4k'] and not source.get('is_4k', False):
+        return False
+    speed = source.get('download_speed', 0)
+    return not (speed > 0 and speed < fp['min_speed'])
+
+
+def _reference_filtering(sources: list[dict], fp: dict) -> tuple[list[dict], list[dict]]:
+    groups: dict[str, list[dict]] = {}
+    for source in sources:
+        if source.get('media_type', 'video') in ['radio', 'audio']:
+            key = f'audio_{source["name"]}'
+        else:
+            key = f'{source["name"]}_{source.get("resolution", "unknown")}'
+        groups.setdefault(key, []).append(source)
+
+    base = []
+    for group in groups.values():
+        ranked = sorted(
+            group,
+            key=lambda x: (
+                -(x.get('download_speed', 0) or 0),
+                x.get('response_time', 9999) or 9999,
+                -(x.get('bitrate', 0) or 0),
+                x.get('name', '') or '',
+            ),
+        )
+        base.extend(ranked[:5])
+    return base, [s for s in base if _reference_qualified(s, fp)]
+
+
+def _random_sources(rng: random.Random, count: int, names: list[str]) -> list[dict]:
+    sources = []
+    for i in range(count):
+        source = {
+            'id': i,
+            'name': rng.choice(names),
+            'url': f'http://example.com/{i}',
+            'status': rng.choice(['success'] * 9 + ['failed']),
+            # 取值集合很小：同组内大量并列，检验并列时保持输入顺序
+            'response_time': rng.choice([100, 100.0, 800, 2500, 4000]),
+            'download_speed': rng.choice([0, 50, 300, 300.0, 900]),
+            'bitrate': rng.choice([0, 200, 1500, 1500.0]),
+        }
+        if rng.random() < 0.2:
+            source['media_type'] = rng.choice(['audio', 'radio'])
+        else:
+            source['media_type'] = 'video'
+            resolution = rng.choice(['1920x1080', '1280x720', '640x360', '', None])
+            if resolution is not None:
+                source['resolution'] = resolution
+        sources.append(source)
+    return sources
+
+
+def _ids(sources: list[dict]) -> list[int]:
+    return [s['id'] for s in sources]
+
+
+class TestHierarchicalFiltering:
+    @pytest.mark.parametrize('seed', range(5))
+    def test_matches_two_stage_reference(self, seed):
+        rng = random.Random(seed)
+        sources = _random_sources(rng, 400, ['CCTV1', 'CCTV2', '湖南卫视', '音乐台'])
+        valid, base, qualified = _filter(_make_manager(), sources)
+
+        expected_base, expected_qualified = _reference_filtering(valid, _FILTER_PARAMS)
+        assert _ids(valid) == [s['id'] for s in sources if s['status'] == 'success']
+        assert _ids(base) == _ids(expected_base)
+        assert _ids(qualified) == _ids(expected_qualified)
+
+    def test_large_group_uses_heap_with_same_result(self):
+        rng = random.Random(42)
+        size = _TOP_K_HEAP_THRESHOLD * 3
+        sources = _random_sources(rng, size, ['CCTV1'])
+        for source in sources:
+            source.update(status='success', media_type='video', resolution='1920x1080')
+        _, base, qualified = _filter(_make_manager(), sources)
+
+        expected_base, expected_qualified = _reference_filtering(sources, _FILTER_PARAMS)
+        assert len(base) == 5
+        assert _ids(base) == _ids(expected_base)
+        assert _ids(qualified) == _ids(expected_qualified)
+
+    def test_ties_keep_input_order(self):
+        size = _TOP_K_HEAP_THRESHOLD + 10
+        sources = [
+            {'id': i, 'name': 'CCTV1', 'status': 'success', 'response_time': 100, 'download_speed': 500}
+            for i in range(size)
+        ]
+        # 小分组（整组排序）与大分组（堆选前 K）在全并列时都按输入顺序取前 5
+        assert _ids(_filter(_make_manager(), sources[:8])[1]) == [0, 1, 2, 3, 4]
+        assert _ids(_filter(_make_manager(), sources)[1]) == [0, 1, 2, 3, 4]
+
+    def test_audio_grouped_by_name_and_only_latency_checked(self):
+        sources = [
+            {
+                'id': i,
+                'name': '音乐台',
+                'status': 'success',
+                'media_type': 'radio' if i % 2 else 'audio',
+                'resolution': f'{i}x{i}',
+                'response_time': 100 * (i + 1),
+                'download_speed': 10,
+                'bitrate': 64,
+            }
+            for i in range(7)
+        ]
+        _, base, qualified = _filter(_make_manager({'max_latency': 300}), sources)
+        # 音频不按分辨率拆组：7 个源同属一组，按速度并列、延迟升序取前 5；低码率/低速不影响音频合格判定
+        assert _ids(base) == [0, 1, 2, 3, 4]
+        assert _ids(qualified) == [0, 1, 2]
+
+    def test_no_valid_sources(self):
+        assert _filter(_make_manager(), [{'id': 0, 'name': 'x', 'status': 'failed'}]) == ([], [], [])
+
+
+class TestOutputDirectory:
+    def test_creates_default_files_once(self, tmp_path):
+        output_dir = tmp_path / 'out'
+        manager = _make_manager(output_params={'output_dir': str(output_dir), 'filename': 'live.m3u'})
+        old_umask = os.umask(0o077)
+        try:
+            assert manager.ensure_output_directory()
+        finally:
+            os.umask(old_umask)
+        assert sorted(os.listdir(output_dir)) == ['live.m3u', 'live.txt']
+        assert stat.S_IMODE((output_dir / 'live.m3u').stat().st_mode) == 0o644
+        assert (output_dir / 'live.m3u').read_text(encoding='utf-8').startswith('#EXTM3U\n')
+
+        # 已存在的文件不覆盖
+        (output_dir / 'live.txt').write_text('real', encoding='utf-8')
+        assert manager.ensure_output_directory()
+        assert (output_dir / 'live.txt').read_text(encoding='utf-8') == 'real'
+
+    def test_rejects_non_directory(self, tmp_path):
+        path = tmp_path / 'file'
+        path.write_text('', encoding='utf-8')
+        manager = _make_manager(output_params={'output_dir': str(path), 'filename': 'live.m3u'})
+        assert not manager.ensure_output_directory()
+        assert not manager._verify_nginx_directory()
+
+    def test_permission_sentinel_skips_repeat_write_test(self, tmp_path):
+        manager = _make_manager(output_params={'output_dir': str(tmp_path), 'filename': 'live.m3u'})
+        assert manager._verify_nginx_directory()
+        assert os.listdir(tmp_path) == ['.permission_verified']
+
+        # 目录未变化且哨兵未过期：不再写入（哨兵 mtime 保持不变）
+        sentinel = tmp_path / '.permission_verified'
+        an_hour_ago = sentinel.stat().st_mtime - 3600
+        os.utime(sentinel, (an_hour_ago, an_hour_ago))
+        assert manager._verify_nginx_directory()
+        assert sentinel.stat().st_mtime == an_hour_ago
+
+        # 目录权限变化后重新写入测试
+        os.chmod(tmp_path, 0o750)
+        before = (tmp_path / '.permission_verified').read_text(encoding='utf-8')
+        assert manager._verify_nginx_directory()
+        assert (tmp_path / '.permission_verified').read_text(encoding='utf-8') != before
+
+
+class TestPlaylistFiles:
+    def test_backup_content_when_generation_fails(self, tmp_path):
+        manager = _make_manager(output_params={'output_dir': str(tmp_path), 'filename': 'live.m3u'})
+        generator = MagicMock()
+        generator.generate_enhanced_m3u_to_file.side_effect = RuntimeError('boom')
+        generator.generate_txt.side_effect = RuntimeError('boom')
+        sources = [{'name': '央视', 'url': 'http://a'}, {'url': 'http://b'}]
+
+        assert manager._generate_enhanced_playlist(generator, sources, 'qualified_', '高级')
+        assert (tmp_path / 'qualified_live.m3u').read_text(encoding='utf-8') == (
+            '#EXTM3U\n#EXTINF:-1,央视\nhttp://a\n#EXTINF:-1,Unknown\nhttp://b\n'
+        )
+        assert (tmp_path / 'qualified_live.txt').read_text(encoding='utf-8') == (
+            '# 高级播放列表 - 备份版本\n央视,http://a\nUnknown,http://b\n'
+        )
+        assert sorted(os.listdir(tmp_path)) == ['qualified_live.m3u', 'qualified_live.txt']
+
+
+class TestStatistics:
+    def test_counts_by_column(self):
+        manager = _make_manager()
+        sources = [
+            {'media_type': 'video', 'resolution': '1920x1080', 'category': '新闻'},
+            {'media_type': 'video', 'resolution': '1920x1080', 'category': '体育'},
+            {'media_type': 'radio', 'resolution': '1920x1080', 'category': '新闻'},
+            {},
+        ]
+        manager.enhanced_output_statistics(sources, sources[:2], sources[:1])
+        lines = [call.args[0] for call in manager.logger.info.call_args_list]
+        assert '  video: 2 个 (50.0%)' in lines
+        assert '  unknown: 1 个 (25.0%)' in lines
+        # 分辨率只统计视频源
+        assert '  1920x1080: 2 个 (100.0%)' in lines
+        assert '  新闻: 2 个 (50.0%)' in lines
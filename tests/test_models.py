@@ -203,6 +203,18 @@ class TestAppConfig:
         assert 'section1' in config
         assert config['section1']['key1'] == 'val1'
 
+    def test_get_all_config_reuses_snapshot_when_db_unchanged(self, monkeypatch):
+        first = models.get_all_config()
+        monkeypatch.setattr(models, '_all_config_cache_time', 0)  # 模拟 TTL 到期
+        assert models.get_all_config() is first
+
+        conn = models.get_conn()
+        conn.execute("INSERT OR REPLACE INTO app_config (key, value) VALUES ('section3.k', 'v')")
+        conn.commit()
+        conn.close()
+        monkeypatch.setattr(models, '_all_config_cache_time', 0)
+        assert models.get_all_config()['section3']['k'] == 'v'
+
 
 # ── 分类规则 ──────────────────────────────
 
@@ -4,7 +4,9 @@
 - 全局白名单强制保留（未过质量过滤也进输出）
 """
 
-from unittest.mock import MagicMock
+import os
+import stat
+from unittest.mock import MagicMock, patch
 
 from app.m3u_generator import M3UGenerator
 
@@ -60,6 +62,26 @@ class TestOutputSortBy:
         # 按 download_speed 降序：b(500) > a(100) > c(50)
         assert flat == ['b', 'a', 'c'], flat
 
+    def test_speed_sort_groups_by_geo_first(self):
+        gen = _make_gen({'output_sort_by': 'speed'})
+        srcs = [
+            {**_src('jp_fast', 900), 'continent': '亚洲', 'country': '日本'},
+            {**_src('cn_slow', 60), 'continent': '亚洲', 'country': '中国'},
+            {**_src('cn_fast', 500, rt=50), 'continent': '亚洲', 'country': '中国'},
+            {**_src('cn_tie', 500, rt=20), 'continent': '亚洲', 'country': '中国'},
+        ]
+        grouped = gen.enhanced_group_and_sort_sources(srcs, 'base')
+        flat = [s['name'] for grp in grouped.values() for s in grp]
+        # 地域升序在前，地域内测速降序、同速按响应时间升序
+        assert flat == ['cn_tie', 'cn_fast', 'cn_slow', 'jp_fast'], flat
+
+    def test_speed_sort_mixed_int_and_float_metrics(self):
+        gen = _make_gen({'output_sort_by': 'speed'})
+        srcs = [_src('int', 300), _src('float', 300.5), _src('none', None), _src('rt_float', 300, rt=50.5)]
+        grouped = gen.enhanced_group_and_sort_sources(srcs, 'base')
+        flat = [s['name'] for grp in grouped.values() for s in grp]
+        assert flat == ['float', 'rt_float', 'int', 'none'], flat
+
     def test_name_sort(self):
         gen = _make_gen({'output_sort_by': 'name'})
         srcs = [_src('c', 100), _src('a', 500), _src('b', 50)]
@@ -123,3 +145,132 @@ class TestWhitelistForceKeep:
         names = {s['name'] for s in filtered}
         assert 'keep' not in names, names
         assert 'good' in names, names
+
+
+class TestFilterThresholds:
+    def test_none_metrics_treated_as_defaults(self):
+        gen = _make_gen({})
+        srcs = [
+            {**_src('none', None, rt=None), 'bitrate': None},
+            {**_src('slow', 10), 'bitrate': None},
+            _src('ok', 200),
+        ]
+        # response_time=None 按 9999ms 处理（超出 max_latency），bitrate/speed=None 视为未测
+        assert [s['name'] for s in gen.enhanced_filter_sources(srcs)] == ['ok']
+
+    def test_resolution_checked_against_bounds(self):
+        gen = _make_gen({})
+        srcs = [{**_src('sd', 200), 'resolution': '320x240'}, {**_src('hd', 200), 'resolution': '1280x720'}]
+        srcs.append(_src('unknown', 200))  # 无分辨率视为满足
+        assert [s['name'] for s in gen.enhanced_filter_sources(srcs)] == ['hd', 'unknown']
+
+    def test_repeated_resolutions_share_verdict(self):
+        gen = _make_gen({})
+        srcs = [{**_src(f'{res}-{i}', 200), 'resolution': res} for i in range(3) for res in ('320x240', '720p')]
+        assert [s['name'] for s in gen.enhanced_filter_sources(srcs)] == ['720p-0', '720p-1', '720p-2']
+
+
+class TestResolutionBounds:
+    def test_min_and_max_bounds(self):
+        gen = _make_gen({})
+        assert gen.is_resolution_meet_min('1920x1080', '720p')
+        assert not gen.is_resolution_meet_min('720p', '1920x1080')
+        assert gen.is_resolution_meet_max('720p', '1080p')
+        assert not gen.is_resolution_meet_max('3840x2160', '1920x1080')
+
+    def test_unparsable_resolution_fallbacks(self):
+        gen = _make_gen({})
+        # 无法解析：下限按 (0, 0)、上限按 (9999, 9999) 处理
+        assert gen.is_resolution_meet_min('abc', '0x0')
+        assert not gen.is_resolution_meet_min('abc', '720p')
+        assert gen.is_resolution_meet_max('abc', 'bad')
+        assert not gen.is_resolution_meet_max('abc', '1080p')
+
+
+class TestGroupKey:
+    def test_group_key_by_field_with_defaults(self):
+        gen = _make_gen({})
+        src = {'country': 'CN', 'region': '', 'source_type': 'online'}
+        assert gen.get_group_key(src, 'country') == 'CN'
+        assert gen.get_group_key(src, 'region') == 'Unknown'
+        assert gen.get_group_key(src, 'media_type') == 'video'
+        assert gen.get_group_key(src, 'source') == 'online'
+        assert gen.get_group_key(src, 'bogus') == 'All Channels'
+
+    def test_grouping_uses_configured_field(self):
+        gen = _make_gen({'group_by': 'country'})
+        srcs = [{**_src('a', 100), 'country': 'JP'}, {**_src('b', 100), 'country': 'CN'}, _src('c', 100)]
+        assert list(gen.enhanced_group_and_sort_sources(srcs, 'base')) == ['JP', 'CN', 'Unknown']
+
+
+class TestFusedFilterAndGroup:
+    def test_qualified_txt_filters_and_groups(self):
+        gen = _make_gen({'output_sort_by': 'name'})
+        srcs = [_src('b', 200), _src('slow', 10), {**_src('fm', 0), 'media_type': 'radio'}, _src('a', 300)]
+        out = gen.generate_enhanced_txt(srcs, 'qualified')
+        assert out == (
+            '# 新闻\na,http://a.example.com/x\nb,http://b.example.com/x\n\n# 收音机\nfm,http://fm.example.com/x\n'
+        )
+
+    def test_qualified_m3u_expands_multi_category_after_filter(self):
+        gen = _make_gen({'output_sort_by': 'name'})
+        gen._tvg_map_cache = {}
+        srcs = [{**_src('multi', 200), 'content': '新闻,体育'}, {**_src('slow', 10), 'content': '新闻,体育'}]
+        grouped, kept, total = gen._filter_and_group(srcs, apply_filter=True, expand_multi=True)
+        assert (kept, total) == (1, 2)
+        assert list(grouped) == ['新闻', '体育']
+        assert '#EXTGRP:体育' in gen.generate_enhanced_m3u(srcs, 'qualified')
+
+
+class TestExtinfCache:
+    def test_round_reuses_extinf_lines(self):
+        gen = _make_gen({'output_sort_by': 'name'})
+        gen._tvg_map_cache = {}
+        srcs = [_src('a', 200), _src('b', 300)]
+        with gen.extinf_cache_round():
+            first = gen.generate_enhanced_m3u(srcs, 'base')
+            with patch.object(gen, 'build_enhanced_extinf', side_effect=AssertionError('rebuilt')):
+                # 同一轮内同一批源（高级列表是基础列表的子集）再次生成时复用 EXTINF
+                second = gen.generate_enhanced_m3u(srcs[1:], 'base')
+            # 换层级或换源对象则重新构建
+            assert 'download-speed' in gen.generate_enhanced_m3u(srcs, 'qualified')
+            assert 'tvg-name="a"' in gen.generate_enhanced_m3u([dict(srcs[0])], 'base')
+        assert second.split('\n')[2:] == first.split('\n')[4:]
+        assert gen._extinf_cache is None
+
+    def test_outside_round_reflects_mutated_source(self):
+        gen = _make_gen({'output_sort_by': 'name'})
+        gen._tvg_map_cache = {}
+        srcs = [_src('a', 200)]
+        gen.generate_enhanced_m3u(srcs, 'qualified')
+        srcs[0]['download_speed'] = 999
+        assert 'download-speed="999' in gen.generate_enhanced_m3u(srcs, 'qualified')
+
+    def test_expanded_copies_not_cached(self):
+        gen = _make_gen({'output_sort_by': 'name'})
+        gen._tvg_map_cache = {}
+        srcs = [{**_src('multi', 200), 'content': '新闻,体育'}, _src('single', 200)]
+        with gen.extinf_cache_round():
+            gen.generate_enhanced_m3u(srcs, 'base')
+            assert [entry[0] for entry in gen._extinf_cache.values()] == [srcs[1]]
+
+
+class TestStreamToFile:
+    def test_file_matches_in_memory_output(self, tmp_path):
+        gen = _make_gen({'output_sort_by': 'name'})
+        gen._tvg_map_cache = {}
+        srcs = [_src('央视', 200), {**_src('fm', 0), 'media_type': 'radio'}]
+        path = tmp_path / 'live.m3u'
+        gen.generate_enhanced_m3u_to_file(srcs, str(path))
+        assert path.read_text(encoding='utf-8') == gen.generate_enhanced_m3u(srcs)
+
+    def test_mode_set_on_open_file(self, tmp_path):
+        gen = _make_gen({})
+        gen._tvg_map_cache = {}
+        path = tmp_path / 'live.m3u'
+        old_umask = os.umask(0o077)
+        try:
+            gen.generate_enhanced_m3u_to_file([_src('a', 200)], str(path), mode=0o644)
+        finally:
+            os.umask(old_umask)
+        assert stat.S_IMODE(path.stat().st_mode) == 0o644
@@ -0,0 +1,179 @@
+"""app.rules.ChannelRules 单元测试
+
+覆盖：YAML 回退加载后的地理信息提取（国家/省份/特别行政区），
+以及无 pyahocorasick 时纯 Python 回退扫描与自动机结果一致。
+"""
+
+import os
+import shutil
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+import app.rules as rules_mod
+from app.rules import ChannelRules, get_channel_rules
+
+YAML_PATH = os.path.join(PROJECT_ROOT, 'config', 'channel_rules.yml')
+
+
+def _default_info() -> dict:
+    return {'country': 'CN', 'continent': 'Asia', 'province': None, 'region': '未知'}
+
+
+@pytest.fixture
+def yaml_path(tmp_path):
+    # 复制到临时目录，避免解析缓存写入仓库 config/
+    path = str(tmp_path / 'channel_rules.yml')
+    shutil.copyfile(YAML_PATH, path)
+    return path
+
+
+@pytest.fixture
+def yaml_rules(yaml_path):
+    rules = ChannelRules(rules_path=yaml_path)
+    rules.load_from_yaml(yaml_path)
+    return rules
+
+
+class TestExtractGeography:
+    """_extract_geography：国家 → 省份 → 地区 的优先级"""
+
+    def test_foreign_country_keyword(self, yaml_rules):
+        info = _default_info()
+        yaml_rules._extract_geography('Japan 综合', info)
+        assert info['country'] == 'JP'
+        assert info['continent'] == '亚洲'
+
+    def test_province_keyword_sets_cn(self, yaml_rules):
+        info = _default_info()
+        yaml_rules._extract_geography('杭州综合', info)
+        assert info['province'] == '浙江'
+        assert info['country'] == 'CN'
+
+    def test_region_overrides_country_code(self, yaml_rules):
+        info = _default_info()
+        yaml_rules._extract_geography('中国香港', info)
+        assert info['country'] == 'HK'
+        assert info['region'] == '香港'
+
+    def test_no_match_keeps_defaults(self, yaml_rules):
+        info = _default_info()
+        yaml_rules._extract_geography('XYZ', info)
+        assert info == _default_info()
+
+    def test_fallback_scan_matches_automaton(self, yaml_rules, monkeypatch):
+        names = ['Japan 综合', '杭州综合', '中国香港', 'Korea KBS', '石家庄新闻', 'XYZ']
+        expected = []
+        for name in names:
+            info = _default_info()
+            yaml_rules._extract_geography(name, info)
+            expected.append(info)
+
+        monkeypatch.setattr(rules_mod, 'ahocorasick', None)
+        yaml_rules._build_geo_index()
+        assert yaml_rules._geo_automaton is None
+        for name, exp in zip(names, expected, strict=True):
+            info = _default_info()
+            yaml_rules._extract_geography(name, info)
+            assert info == exp
+
+
+class TestDetermineCategories:
+    """determine_categories：预编译正则预筛后的分类结果"""
+
+    def test_high_priority_content(self, yaml_rules):
+        assert yaml_rules.determine_category('CCTV-1 综合') == '央视频道'
+
+    def test_longest_keyword_wins(self, yaml_rules):
+        assert yaml_rules.determine_category('湖南卫视') == '卫视频道'
+
+    def test_unmatched_dimension_is_unknown(self, yaml_rules):
+        assert yaml_rules.determine_categories('XYZ')['content'] == '未知'
+
+    def test_name_shorter_than_any_keyword(self, yaml_rules):
+        yaml_rules.rules = {'categories': [{'name': '新闻频道', 'keywords': ['新闻']}]}
+        yaml_rules._rebuild_from_rules()
+        assert yaml_rules._min_keyword_len == 2
+        assert yaml_rules.determine_category('新') == '未知'
+        assert yaml_rules.determine_category('新闻') == '新闻频道'
+
+
+class TestResultCache:
+    """extract_channel_info 结果缓存：返回独立副本、规则重载后失效"""
+
+    def test_cached_result_is_independent_copy(self, yaml_rules):
+        first = yaml_rules.extract_channel_info('湖南卫视')
+        first['category'] = 'mutated'
+        second = yaml_rules.extract_channel_info('湖南卫视', source_id=None)
+        assert second['category'] == '卫视频道'
+
+    def test_reload_yaml_clears_cache(self, yaml_rules, yaml_path):
+        yaml_rules.extract_channel_info('湖南卫视')
+        assert '湖南卫视' in yaml_rules._info_cache
+        yaml_rules.load_from_yaml(yaml_path)
+        assert '湖南卫视' not in yaml_rules._info_cache
+
+
+class TestYamlParseCache:
+    """load_from_yaml：按 (mtime_ns, size) 校验的 JSON 解析缓存"""
+
+    def test_cache_written_and_reused(self, yaml_rules, yaml_path):
+        cache_path = yaml_path + '.cache.json'
+        assert os.path.exists(cache_path)
+        rules = yaml_rules.load_from_yaml(yaml_path)
+        assert rules['categories'][0]['name'] == '央视频道'
+
+    def test_stale_cache_ignored(self, yaml_rules, yaml_path):
+        with open(yaml_path, 'a', encoding='utf-8') as f:
+            f.write('\n# touched\n')
+        st = os.stat(yaml_path)
+        assert yaml_rules._read_yaml_cache(yaml_path, [st.st_mtime_ns, st.st_size]) is None
+
+    def test_json_rules_file_loaded_directly(self, yaml_rules, tmp_path):
+        json_path = tmp_path / 'channel_rules.json'
+        json_path.write_text(
+            '{"categories": [{"name": "新闻频道", "priority": 1, "keywords": ["新闻"]}]}', encoding='utf-8'
+        )
+        yaml_rules.load_from_yaml(str(json_path))
+        assert yaml_rules.determine_category('北京新闻') == '新闻频道'
+
+    def test_malformed_category_skipped(self, yaml_rules):
+        yaml_rules.rules = {'categories': ['bad', {'priority': 1}, {'name': '新闻频道', 'keywords': ['新闻']}]}
+        yaml_rules._rebuild_from_rules()
+        assert [r['name'] for r in yaml_rules.rule_list] == ['新闻频道']
+
+    def test_category_rules_presorted_by_priority(self, yaml_rules):
+        yaml_rules.rules = {'categories': [{'name': 'B', 'priority': 5}, {'name': 'A', 'priority': 1}, 'bad']}
+        yaml_rules._rebuild_from_rules()
+        result = yaml_rules.get_category_rules()
+        assert [r['name'] for r in result] == ['A', 'B']
+        result.clear()
+        assert len(yaml_rules.get_category_rules()) == 2
+
+
+def test_get_channel_rules_shares_instance_per_path(yaml_path):
+    first = get_channel_rules(yaml_path)
+    assert get_channel_rules(yaml_path) is first
+    assert isinstance(first, ChannelRules)
+
+
+def test_regex_fallback_matches_automaton(yaml_rules, monkeypatch):
+    names = ['CCTV-1 综合', '湖南卫视', '北京新闻', 'FM103.9 交通广播', 'XYZ']
+    expected = [yaml_rules.determine_categories(n) for n in names]
+    monkeypatch.setattr(rules_mod, 'ahocorasick', None)
+    yaml_rules._build_indexes()
+    assert all(automaton is None for _, _, automaton in yaml_rules._dim_index)
+    assert [yaml_rules.determine_categories(n) for n in names] == expected
+
+
+def test_rules_load_lazily_on_first_use(yaml_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(ChannelRules, '_load_from_db', lambda self: calls.append(self) or self.load_from_yaml())
+    rules = ChannelRules(rules_path=yaml_path)
+    assert calls == []
+    assert rules.determine_category('湖南卫视') == '卫视频道'
+    rules.extract_channel_info('CCTV-1')
+    assert len(calls) == 1
@@ -9,7 +9,7 @@ import os
 
 import pytest
 from app.exceptions import FileException
-from app.utils import _backup_file, atomic_write, safe_read_file
+from app.utils import _backup_file, atomic_write, decode_bytes, safe_read_file
 
 # ── atomic_write ──────────────────────────────
 
@@ -135,6 +135,12 @@ class TestSafeReadFile:
         assert not content.startswith('\ufeff')
         assert 'BOM test' in content
 
+    def test_crlf_normalized(self, tmp_path):
+        """与文本模式读取一致：CRLF / CR 统一为 LF"""
+        filepath = tmp_path / 'crlf.txt'
+        filepath.write_bytes('第一行\r\n第二行\r第三行'.encode('gbk'))
+        assert safe_read_file(str(filepath)) == '第一行\n第二行\n第三行'
+
     def test_binary_fallback(self, tmp_path):
         """无法解码时用 errors='replace' 兜底"""
         filepath = str(tmp_path / 'binary.dat')
@@ -144,6 +150,21 @@ class TestSafeReadFile:
         assert isinstance(content, str)
 
 
+class TestDecodeBytes:
+    """decode_bytes：前缀探测 + 全文解码"""
+
+    def test_multibyte_char_across_sample_boundary(self):
+        text = 'a' * (64 * 1024 - 1) + '中文'
+        assert decode_bytes(text.encode('utf-8'), ['utf-8', 'gbk']) == text
+
+    def test_error_after_sample_falls_through(self):
+        text = 'a' * (70 * 1024) + '中文'
+        assert decode_bytes(text.encode('gbk'), ['utf-8', 'gbk']) == text
+
+    def test_all_fail_returns_none(self):
+        assert decode_bytes(b'\xff\xfe\xfd', ['utf-8']) is None
+
+
 # ── _backup_file ──────────────────────────────
 
 
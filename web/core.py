@@ -78,14 +78,60 @@ def _get_csrf_exempt_paths():
 _DEFAULTS_YAML_PATH = os.path.join(PROJECT_ROOT, 'config', 'config-defaults.yaml')
 
 
+# 解析缓存：config-defaults.yaml 的 SHA-256 命中时直接读取 JSON，跳过 YAML 解析（容器频繁重启时省去重复解析）
+_DEFAULTS_CACHE_PATH = _DEFAULTS_YAML_PATH + '.cache.json'
+_DEFAULTS_CACHE_VERSION = 1
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def _read_defaults_cache(digest: str) -> dict | None:
+    """读取默认值解析缓存；缺失、损坏、版本或哈希不一致时返回 None"""
+    try:
+        with open(_DEFAULTS_CACHE_PATH, encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(cached, dict)
+        or cached.get('version') != _DEFAULTS_CACHE_VERSION
+        or cached.get('sha256') != digest
+    ):
+        return None
+    data = cached.get('data')
+    return data if isinstance(data, dict) else None
+
+
+def _write_defaults_cache(digest: str, data: dict):
+    """原子写入默认值解析缓存（临时文件 + os.replace）；失败仅记录调试日志"""
+    tmp_path = f'{_DEFAULTS_CACHE_PATH}.{os.getpid()}.tmp'
+    try:
+        payload = json.dumps({'version': _DEFAULTS_CACHE_VERSION, 'sha256': digest, 'data': data}, ensure_ascii=False)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_path, _DEFAULTS_CACHE_PATH)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug(f'config-defaults.yaml 解析缓存写入跳过: {e}')
+        with suppress(OSError):
+            os.remove(tmp_path)
+
+
 def _load_defaults_from_yaml() -> dict | None:
-    """从 config-defaults.yaml 加载默认值"""
-    if os.path.exists(_DEFAULTS_YAML_PATH):
-        try:
-            with open(_DEFAULTS_YAML_PATH, encoding='utf-8') as f:
-                return yaml.safe_load(f)
-        except Exception as e:
-            logger.warning(f'加载 config-defaults.yaml 失败: {e}')
+    """从 config-defaults.yaml 加载默认值（按文件 SHA-256 命中解析缓存时跳过 YAML 解析）"""
+    try:
+        with open(_DEFAULTS_YAML_PATH, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        data = _read_defaults_cache(digest)
+        if data is not None:
+            return data
+        data = yaml.load(raw.decode('utf-8'), Loader=_YAML_LOADER)
+        if isinstance(data, dict):
+            _write_defaults_cache(digest, data)
+        return data
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f'加载 config-defaults.yaml 失败: {e}')
     return None
 
 
@@ -286,6 +332,12 @@ SECTION_SCHEMA: dict[str, dict[str, tuple]] = {
         'file': ('str', './log/app.log', '日志文件路径'),
         'max_size': ('int', '10', '最大日志大小(MB)'),
         'backup_count': ('int', '5', '备份文件数'),
+        'rotation': (
+            'str',
+            'internal',
+            '日志轮转方式',
+            'internal=按大小自动轮转；external=由 logrotate 等外部工具轮转（copytruncate/移走后自动重新打开）',
+        ),
     },
     'Filter': {
         'max_latency': ('int', '4000', '最大延迟(ms)'),
@@ -1494,11 +1546,11 @@ def _load_source_manager():
     if _sm_instance is not None:
         return _sm_instance
     try:
-        from app import ChannelRules, Config, Logger, SourceManager
+        from app import Config, Logger, SourceManager, get_channel_rules
 
         config = Config()
         logger_sm = Logger(config.get_logging_config()).logger
-        rules = ChannelRules()
+        rules = get_channel_rules()
         _sm_instance = SourceManager(config, logger_sm, rules)
         return _sm_instance
     except Exception as e:
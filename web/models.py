@@ -9,16 +9,19 @@ import time
 # ── get_all_config() TTL 缓存（5 秒，避免同一请求内多次读取 SQLite）──
 _all_config_cache: dict | None = None
 _all_config_cache_time: float = 0
+_all_config_cache_path: str | None = None  # 缓存对应的 DB_PATH（切换数据库时视为失效）
+_all_config_cache_stamp: tuple | None = None  # 读取缓存时数据库文件的指纹（见 _config_db_stamp）
 _ALL_CONFIG_CACHE_TTL: float = 5.0
 _all_config_cache_lock = threading.Lock()
 
 
 def invalidate_config_cache():
     """使配置缓存失效（write 操作时调用）。"""
-    global _all_config_cache, _all_config_cache_time
+    global _all_config_cache, _all_config_cache_time, _all_config_cache_stamp
     with _all_config_cache_lock:
         _all_config_cache = None
         _all_config_cache_time = 0
+        _all_config_cache_stamp = None
 
 
 import datetime
@@ -26,6 +29,7 @@ import logging
 import os
 import re
 import sqlite3
+import sys
 from contextlib import contextmanager, suppress
 
 import bcrypt
@@ -130,6 +134,12 @@ def _execute(sql: str, params=()):
                     logger.warning(f'关闭数据库连接异常: {_re}')
 
 
+# 运行期校验/规范化用到的正则在模块加载时编译一次，函数体内只做匹配
+# 密码字符类别：大写 / 小写 / 数字 / 特殊符号
+_PASSWORD_CATEGORY_RES = tuple(re.compile(p) for p in (r'[A-Z]', r'[a-z]', r'[0-9]', r'[^A-Za-z0-9]'))
+# 路径分隔符（/ 与 \ 连续出现统一为单个 /）
+_PATH_SEP_RE = re.compile(r'[/\\]+')
+
 # 常见弱口令黑名单（GB/T 39786-2021：不得使用常见弱口令）。作为组合复杂度之外的兜底，
 # 避免 Password@123 / 12345678 等高频弱口令通过。大小写不敏感比对。
 _WEAK_PASSWORD_BLACKLIST = frozenset(
@@ -169,15 +179,7 @@ def password_complexity_ok(pw: str) -> bool:
         return False
     if pw.lower() in _WEAK_PASSWORD_BLACKLIST:
         return False
-    cats = 0
-    if re.search(r'[A-Z]', pw):
-        cats += 1
-    if re.search(r'[a-z]', pw):
-        cats += 1
-    if re.search(r'[0-9]', pw):
-        cats += 1
-    if re.search(r'[^A-Za-z0-9]', pw):
-        cats += 1
+    cats = sum(1 for pattern in _PASSWORD_CATEGORY_RES if pattern.search(pw))
     return cats >= 3
 
 
@@ -534,7 +536,7 @@ def init_db(admin_password: str | None = None):
         # 统一正斜杠：保证 Windows/Linux/Docker 跨平台一致，
         # 避免 Windows 反斜杠在 Linux 部署时被误当作文件名一部分导致永久缺失。
         _rel = (_out_dir.rstrip('/\\') + '/' + _fname).strip()
-        _rel = re.sub(r'[/\\]+', '/', _rel)
+        _rel = _PATH_SEP_RE.sub('/', _rel)
         if not _rel.startswith('.'):
             _rel = './' + _rel
         # 规范化：过滤空串 + 去重（保序），并将历史脏值（含 Windows 反斜杠）重写为 / 版本
@@ -543,7 +545,7 @@ def init_db(admin_password: str | None = None):
         for _d in _raw:
             if not isinstance(_d, str) or not _d.strip():
                 continue
-            _norm = re.sub(r'[/\\]+', '/', _d.strip())  # 统一分隔符后参与比对与存储
+            _norm = _PATH_SEP_RE.sub('/', _d.strip())  # 统一分隔符后参与比对与存储
             if _norm in _seen:
                 continue
             _seen.add(_norm)
@@ -553,7 +555,7 @@ def init_db(admin_password: str | None = None):
         # 历史上 ensure 曾在 local_dirs 退化时把该默认目录整体覆盖丢失，导致用户放进 config/sources 的源解析不到。
         # 此处强制保证其存在，且缺失时自动建目录，避免界面误报「路径缺失」。
         _default_local = Config._DEFAULT_VALUES.get('Sources.local_dirs', './config/sources')
-        _default_local_norm = re.sub(r'[/\\]+', '/', str(_default_local).strip())
+        _default_local_norm = _PATH_SEP_RE.sub('/', str(_default_local).strip())
         if not _default_local_norm.startswith('.'):
             _default_local_norm = './' + _default_local_norm
         if _default_local_norm not in _seen:
@@ -756,6 +758,8 @@ def _get_all_config_raw() -> dict[str, dict[str, str]]:
             else:
                 section = '__default__'
                 field = key
+            # 驻留段名/键名：与代码中的字面量（编译期已驻留）是同一对象，dict 查找走指针相等的快速路径
+            section, field = sys.intern(section), sys.intern(field)
             if section not in result:
                 result[section] = {}
             result[section][field] = value
@@ -764,21 +768,47 @@ def _get_all_config_raw() -> dict[str, dict[str, str]]:
         conn.close()
 
 
+def _config_db_stamp() -> tuple:
+    """数据库文件与 WAL 文件的 (mtime_ns, size) 指纹，任何提交都会改变它"""
+    stamp = [DB_PATH]
+    for path in (DB_PATH, DB_PATH + '-wal'):
+        try:
+            st = os.stat(path)
+            stamp.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
 def get_all_config() -> dict[str, dict[str, str]]:
-    """返回 {section: {key: value}} 格式的全量配置（敏感字段自动解密，5 秒 TTL 缓存）"""
-    global _all_config_cache, _all_config_cache_time
+    """返回 {section: {key: value}} 格式的全量配置（敏感字段自动解密，5 秒 TTL 缓存）
+
+    TTL 到期后先比对数据库文件指纹，文件未变则直接续期，跳过全表查询与解密。
+    """
+    global _all_config_cache, _all_config_cache_time, _all_config_cache_path, _all_config_cache_stamp
     now = time.time()
     cached = _all_config_cache
     cached_time = _all_config_cache_time
-    if cached is not None and now - cached_time < _ALL_CONFIG_CACHE_TTL:
+    if cached is not None and now - cached_time < _ALL_CONFIG_CACHE_TTL and _all_config_cache_path == DB_PATH:
         return cached
     with _all_config_cache_lock:
         now = time.time()
-        if _all_config_cache is not None and now - _all_config_cache_time < _ALL_CONFIG_CACHE_TTL:
+        if (
+            _all_config_cache is not None
+            and now - _all_config_cache_time < _ALL_CONFIG_CACHE_TTL
+            and _all_config_cache_path == DB_PATH
+        ):
+            return _all_config_cache
+        # 指纹在查询前取：查询期间若有写入，下次比对必然不一致，不会漏掉
+        stamp = _config_db_stamp()
+        if _all_config_cache is not None and stamp == _all_config_cache_stamp:
+            _all_config_cache_time = now
             return _all_config_cache
         result = _get_all_config_raw()
         _all_config_cache = result
         _all_config_cache_time = now
+        _all_config_cache_path = DB_PATH
+        _all_config_cache_stamp = stamp
         return result
 
 
@@ -808,8 +838,11 @@ def seed_app_config_defaults() -> int:
     """
     conn = get_conn()
     try:
+        # 判空与整批写入放在同一个写事务里：多进程同时首启时只有一个真正写入，且要么全写要么不写
+        conn.execute('BEGIN IMMEDIATE')
         count = conn.execute('SELECT COUNT(*) FROM app_config').fetchone()[0]
         if count > 0:
+            conn.rollback()
             logger.info('app_config 已有数据，跳过默认值种子')
             return 0
 
@@ -822,6 +855,7 @@ def seed_app_config_defaults() -> int:
             entries,
         )
         conn.commit()
+        invalidate_config_cache()
         logger.info(f'已写入 {len(entries)} 条配置默认值到 app_config')
         return len(entries)
     except Exception as e:
@@ -846,15 +880,20 @@ def fill_missing_app_config_defaults() -> int:
 
     conn = get_conn()
     try:
+        # 读取已有键与补写在同一个写事务内完成（整批一次提交）
+        conn.execute('BEGIN IMMEDIATE')
         existing = {row[0] for row in conn.execute('SELECT key FROM app_config').fetchall()}
         now = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         entries = [(key, value, now) for key, value in Config._DEFAULT_VALUES.items() if key not in existing]
-        if entries:
+        if not entries:
+            conn.rollback()
+        else:
             conn.executemany(
                 'INSERT OR IGNORE INTO app_config (key, value, updated_at) VALUES (?, ?, ?)',
                 entries,
             )
             conn.commit()
+            invalidate_config_cache()
             logger.info(f'已补全 {len(entries)} 条缺失配置默认值: ' + ', '.join(k for k, _, _ in entries))
         return len(entries)
     except Exception as e:
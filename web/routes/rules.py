@@ -9,7 +9,6 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from web import models
 from web.core import (
     PROJECT_ROOT,
-    app,
     get_current_user,
     require_admin,
 )
@@ -374,15 +373,13 @@ async def api_test_classification(
         raise HTTPException(status_code=400, detail='channel_name 不能为空')
 
     try:
-        from app import ChannelRules
+        from app import get_channel_rules
     except ImportError:
         raise HTTPException(status_code=500, detail='无法导入 ChannelRules 模块') from None
 
     CHANNEL_RULES_PATH = os.path.join(PROJECT_ROOT, 'config', 'channel_rules.yml')
-    # 使用模块级缓存避免每次创建新实例
-    if not hasattr(app, '_test_rules_instance'):
-        app._test_rules_instance = ChannelRules(rules_path=CHANNEL_RULES_PATH)  # type: ignore[attr-defined]
-    rules_engine = app._test_rules_instance  # type: ignore[attr-defined]
+    # 进程内共享实例，避免每次创建新实例
+    rules_engine = get_channel_rules(CHANNEL_RULES_PATH)
 
     # 多维分类
     categories = rules_engine.determine_categories(channel_name)